@@ -1,6 +1,9 @@
 # pages/1_🎮_Games_Hub.py
 
 import streamlit as st
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Tuple
 from tools.games import binary_speed_challenge, speed_binary_addition, speed_hex_conversion
 from components.streamlit_auth import render_auth_ui, render_auth_status_badge
 from components.leaderboard import render_leaderboard
@@ -8,31 +11,41 @@ from components.game_stats import render_game_stats, render_per_game_stats
 
 # ========================= Games Registry =========================
 
+@dataclass(frozen=True, slots=True)
+class GameInfo:
+    """Static description of a game in the hub"""
+    module: ModuleType
+    description: str
+    emoji: str
+    difficulty: str
+    duration: str
+    skills: Tuple[str, ...]
+
 AVAILABLE_GAMES = {
-    "Binary Speed Challenge": {
-        "module": binary_speed_challenge,
-        "description": "Convert binary and decimal numbers as fast as you can! Choose your difficulty, build streaks for multipliers, and race against the clock.",
-        "emoji": "⚡",
-        "difficulty": "Easy to Expert",
-        "duration": "60 seconds",
-        "skills": ["Binary Conversion", "Speed", "Accuracy"]
-    },
-    "Speed Binary Addition": {
-        "module": speed_binary_addition,
-        "description": "Add binary numbers at lightning speed! Mix of binary+binary and binary+decimal problems. Build streaks and master carry propagation.",
-        "emoji": "➕",
-        "difficulty": "Easy to Expert",
-        "duration": "60 seconds",
-        "skills": ["Binary Addition", "Carry Logic", "Speed"]
-    },
-    "Speed Hex Conversion": {
-        "module": speed_hex_conversion,
-        "description": "Convert between binary and hexadecimal at lightning speed! Master both directions with instant feedback.",
-        "emoji": "🔢",
-        "difficulty": "Easy to Expert",
-        "duration": "60 seconds",
-        "skills": ["Hex Conversion", "Binary", "Speed"]
-    }
+    "Binary Speed Challenge": GameInfo(
+        module=binary_speed_challenge,
+        description="Convert binary and decimal numbers as fast as you can! Choose your difficulty, build streaks for multipliers, and race against the clock.",
+        emoji="⚡",
+        difficulty="Easy to Expert",
+        duration="60 seconds",
+        skills=("Binary Conversion", "Speed", "Accuracy")
+    ),
+    "Speed Binary Addition": GameInfo(
+        module=speed_binary_addition,
+        description="Add binary numbers at lightning speed! Mix of binary+binary and binary+decimal problems. Build streaks and master carry propagation.",
+        emoji="➕",
+        difficulty="Easy to Expert",
+        duration="60 seconds",
+        skills=("Binary Addition", "Carry Logic", "Speed")
+    ),
+    "Speed Hex Conversion": GameInfo(
+        module=speed_hex_conversion,
+        description="Convert between binary and hexadecimal at lightning speed! Master both directions with instant feedback.",
+        emoji="🔢",
+        difficulty="Easy to Expert",
+        duration="60 seconds",
+        skills=("Hex Conversion", "Binary", "Speed")
+    )
 }
 
 # ========================= State Management =========================
@@ -58,11 +71,10 @@ def return_to_landing():
 
 # ========================= UI Components =========================
 
-def render_game_card(game_name: str, game_info: dict):
-    """Render a game card with info and play button"""
-
-    with st.container():
-        st.markdown(f"""
+@st.cache_data
+def _card_html(game_name: str, emoji: str, description: str) -> str:
+    """Build the HTML header of a game card (cached across reruns)"""
+    return f"""
         <div style="
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 25px;
@@ -71,20 +83,29 @@ def render_game_card(game_name: str, game_info: dict):
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
         ">
             <h2 style="color: white; margin: 0 0 10px 0;">
-                {game_info['emoji']} {game_name}
+                {emoji} {game_name}
             </h2>
             <p style="color: rgba(255,255,255,0.95); font-size: 16px; margin: 0; line-height: 1.5;">
-                {game_info['description']}
+                {description}
             </p>
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+def render_game_card(game_name: str, game_info: GameInfo):
+    """Render a game card with info and play button"""
+
+    with st.container():
+        st.markdown(
+            _card_html(game_name, game_info.emoji, game_info.description),
+            unsafe_allow_html=True
+        )
 
         col1, col2 = st.columns([2, 1])
 
         with col1:
-            st.markdown(f"**⏱️ Duration:** {game_info['duration']}")
-            st.markdown(f"**📊 Difficulty:** {game_info['difficulty']}")
-            st.markdown(f"**🎯 Skills:** {', '.join(game_info['skills'])}")
+            st.markdown(f"**⏱️ Duration:** {game_info.duration}")
+            st.markdown(f"**📊 Difficulty:** {game_info.difficulty}")
+            st.markdown(f"**🎯 Skills:** {', '.join(game_info.skills)}")
 
         with col2:
             st.markdown("")  # Spacing
@@ -133,7 +154,7 @@ def render_game_screen(game_name: str):
     """Render the selected game with a back button"""
 
     game_info = AVAILABLE_GAMES[game_name]
-    game_module = game_info['module']
+    game_module = game_info.module
 
     # Add back button and auth status at the top
     col1, col2, col3 = st.columns([1, 1, 2])
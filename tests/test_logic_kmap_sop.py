@@ -0,0 +1,32 @@
+import pytest
+
+from tools.logic_kmap_sop import _eval_expr_to_minterms
+
+VARS = ["A", "B", "C", "D", "E"]
+
+
+@pytest.mark.parametrize("expr, expected", [
+    ("A + B·C", {3, 4, 5, 6, 7}),
+    ("(A + B)'C", {1}),
+    ("a b' + !c", {0, 2, 4, 5, 6}),
+    ("A + 1", {0, 1}),
+    ("A . 0", set()),
+])
+def test_boolean_expressions(expr, expected):
+    assert _eval_expr_to_minterms(expr, VARS) == expected
+
+
+@pytest.mark.parametrize("expr", [
+    "AB^C",
+    "A^BC",
+    "!A^B.C",
+    "A==B",
+    "A<B",
+    "A-B",
+    "A + 2",
+    "A()",
+    "A +",
+])
+def test_unsupported_syntax_raises(expr):
+    with pytest.raises(ValueError):
+        _eval_expr_to_minterms(expr, VARS)
@@ -4,15 +4,16 @@ import streamlit as st
 import time
 import random
 import re
+from collections import deque
 from typing import Optional
 from datetime import datetime
 from .game_utils import (
     ADDITION_DIFFICULTY_CONFIG,
     generate_addition_operand,
+    generate_addition_operands,
     generate_distractors_decimal,
     generate_distractors_binary,
     calculate_score,
-    format_time,
     get_performance_rating
 )
 
@@ -106,8 +107,51 @@ def render_compact_timer(start_time: float, duration: int = 60) -> None:
     """
     st.components.v1.html(html, height=50)
 
+# Static payload, so reruns reuse the same iframe instead of re-running the script.
+# A single MutationObserver focuses the newest text input whenever the DOM changes.
+AUTO_FOCUS_HTML = """
+    <script>
+        const doc = window.parent.document;
+
+        function focusLatestInput() {
+            // Stop once this component has been removed (game screen left)
+            if (!window.frameElement || !window.frameElement.isConnected) {
+                observer.disconnect();
+                return;
+            }
+            const inputs = doc.querySelectorAll('input[type="text"]');
+            if (inputs.length > 0) {
+                const input = inputs[inputs.length - 1];
+                if (doc.activeElement !== input) {
+                    input.focus();
+                }
+            }
+        }
+
+        // Replace any observer left behind by a previous iframe
+        if (window.parent.binaryGameFocusObserver) {
+            window.parent.binaryGameFocusObserver.disconnect();
+        }
+        const observer = new MutationObserver(focusLatestInput);
+        observer.observe(doc.body, { childList: true, subtree: true });
+        window.parent.binaryGameFocusObserver = observer;
+
+        focusLatestInput();
+    </script>
+"""
+
 # ========================= Game State Management =========================
 
+# Answer history is stored column-wise: one parallel list per field
+HISTORY_FIELDS = ('correct', 'time', 'points', 'question', 'user_answer', 'correct_answer')
+
+# Questions are pre-built in batches so answering only pops the next one
+QUESTION_QUEUE_SIZE = 8
+QUESTION_QUEUE_LOW_WATER = 3
+
+# Widget keys for the multiple choice buttons (correct answer + up to 3 distractors)
+CHOICE_KEYS = tuple(f"choice_{idx}" for idx in range(4))
+
 def init_game_state():
     """Initialize game state in session_state"""
     if 'binary_game' not in st.session_state:
@@ -125,11 +169,20 @@ def init_game_state():
             'best_streak': 0,
             'correct_count': 0,
             'total_count': 0,
-            'history': [],
+            'history_correct': [],
+            'history_time': [],
+            'history_points': [],
+            'history_question': [],
+            'history_user_answer': [],
+            'history_correct_answer': [],
+            'total_answer_time': 0.0,  # Running sum of answer times (for avg time)
             'last_result': None,  # Store last answer result for display
             'asked_numbers': set(),  # Track numbers already asked
+            'question_queue': deque(),  # Pre-built upcoming questions
+            'questions_built': 0,  # Number of questions built so far (for Mixed mode)
             'result_saved': False,  # Track if result has been saved to DB
-            'stats_recorded': False  # Track if stats have been recorded
+            'stats_recorded': False,  # Track if stats have been recorded
+            'final_stats': None  # Results-screen stats, computed once per finished game
         }
 
 def reset_game():
@@ -148,13 +201,37 @@ def reset_game():
         'best_streak': 0,
         'correct_count': 0,
         'total_count': 0,
-        'history': [],
+        'history_correct': [],
+        'history_time': [],
+        'history_points': [],
+        'history_question': [],
+        'history_user_answer': [],
+        'history_correct_answer': [],
+        'total_answer_time': 0.0,
         'last_result': None,
         'asked_numbers': set(),
+        'question_queue': deque(),
+        'questions_built': 0,
         'result_saved': False,  # Track if result has been saved to DB
-        'stats_recorded': False  # Track if stats have been recorded
+        'stats_recorded': False,  # Track if stats have been recorded
+        'final_stats': None
     }
 
+def record_history(game: dict, correct: bool, answer_time: float, points: int,
+                   question: str, user_answer: str, correct_answer: str):
+    """Append one answer to the column-wise history lists"""
+    game['history_correct'].append(correct)
+    game['history_time'].append(answer_time)
+    game['history_points'].append(points)
+    game['history_question'].append(question)
+    game['history_user_answer'].append(user_answer)
+    game['history_correct_answer'].append(correct_answer)
+
+def history_as_records(game: dict) -> list:
+    """Rebuild the history as a list of per-answer dicts (for storage)"""
+    columns = [game[f'history_{field}'] for field in HISTORY_FIELDS]
+    return [dict(zip(HISTORY_FIELDS, row)) for row in zip(*columns)]
+
 def is_game_active() -> bool:
     """Check if game is still active (within time limit + grace period)"""
     game = st.session_state.binary_game
@@ -165,16 +242,19 @@ def is_game_active() -> bool:
     # Add 2-second grace period to prevent timer lock issue
     return elapsed < (game['duration'] + 2)
 
-def generate_question():
-    """Generate a new question based on game settings"""
-    game = st.session_state.binary_game
-
-    # Generate unique number (avoid duplicates, ensure > 0)
-    max_attempts = 50
-    for _ in range(max_attempts):
-        decimal_val, binary_str = generate_addition_operand(game['difficulty'])
+def _build_question(game: dict, candidates) -> dict:
+    """Build one question dict based on game settings, taking its number from candidates"""
+    # Take the next unique candidate (avoid duplicates, ensure > 0)
+    for decimal_val, binary_str in candidates:
         if decimal_val not in game['asked_numbers'] and decimal_val > 0:
             break
+    else:
+        # Candidates exhausted: generate numbers one at a time
+        max_attempts = 50
+        for _ in range(max_attempts):
+            decimal_val, binary_str = generate_addition_operand(game['difficulty'])
+            if decimal_val not in game['asked_numbers'] and decimal_val > 0:
+                break
 
     # Add to asked numbers
     game['asked_numbers'].add(decimal_val)
@@ -182,7 +262,7 @@ def generate_question():
     # Determine question type based on mode
     if game['mode'] == 'Mixed':
         # Alternate between Binary→Decimal and Decimal→Binary
-        question_type = 'binary_to_decimal' if game['total_count'] % 2 == 0 else 'decimal_to_binary'
+        question_type = 'binary_to_decimal' if game['questions_built'] % 2 == 0 else 'decimal_to_binary'
     elif game['mode'] == 'Binary → Decimal':
         question_type = 'binary_to_decimal'
     else:  # Decimal → Binary
@@ -199,8 +279,9 @@ def generate_question():
 
         if game['input_type'] == 'Multiple Choice':
             distractors = generate_distractors_decimal(decimal_val, 3)
-            choices = [str(decimal_val)] + [str(d) for d in distractors]
-            random.shuffle(choices)
+            # Insert the correct answer at a uniformly random position
+            choices = [str(d) for d in distractors]
+            choices.insert(random.randint(0, len(choices)), str(decimal_val))
             question['choices'] = choices
 
     else:  # decimal_to_binary
@@ -214,13 +295,34 @@ def generate_question():
 
         if game['input_type'] == 'Multiple Choice':
             distractors = generate_distractors_binary(binary_str, 3)
-            choices = [binary_str] + distractors
-            random.shuffle(choices)
+            choices = list(distractors)
+            choices.insert(random.randint(0, len(choices)), binary_str)
             question['choices'] = choices
 
-    game['current_question'] = question
+    game['questions_built'] += 1
+    return question
+
+def _refill_queue(game: dict, n: int = QUESTION_QUEUE_SIZE):
+    """Append n freshly built questions to the question queue"""
+    # Draw the numbers for the whole batch at once, with spares to cover duplicates
+    candidates = iter(generate_addition_operands(game['difficulty'], n * 4))
+    queue = game['question_queue']
+    for _ in range(n):
+        queue.append(_build_question(game, candidates))
+
+def generate_question():
+    """Advance to the next pre-built question, topping up the queue when low"""
+    game = st.session_state.binary_game
+
+    if not game['question_queue']:
+        _refill_queue(game)
+
+    game['current_question'] = game['question_queue'].popleft()
     game['question_start_time'] = time.time()
 
+    if len(game['question_queue']) < QUESTION_QUEUE_LOW_WATER:
+        _refill_queue(game)
+
 def check_answer(user_answer: str, is_skip: bool = False) -> bool:
     """Check if user answer is correct and update game state"""
     game = st.session_state.binary_game
@@ -237,6 +339,7 @@ def check_answer(user_answer: str, is_skip: bool = False) -> bool:
 
     # Update stats
     game['total_count'] += 1
+    game['total_answer_time'] += answer_time
 
     if is_correct:
         game['correct_count'] += 1
@@ -249,14 +352,8 @@ def check_answer(user_answer: str, is_skip: bool = False) -> bool:
         game['score'] += points
 
         # Record history
-        game['history'].append({
-            'correct': True,
-            'time': answer_time,
-            'points': points,
-            'question': question['display_question'],
-            'user_answer': user_answer,
-            'correct_answer': correct_answer
-        })
+        record_history(game, True, answer_time, points,
+                       question['display_question'], user_answer, correct_answer)
 
         # Store result for display
         game['last_result'] = {
@@ -271,16 +368,12 @@ def check_answer(user_answer: str, is_skip: bool = False) -> bool:
         penalty = 0
         if game['difficulty'] == 'Expert' and game['input_type'] == 'Multiple Choice' and not is_skip:
             penalty = -10
-            game['score'] = max(0, game['score'] + penalty)  # Don't go below 0
-
-        game['history'].append({
-            'correct': False,
-            'time': answer_time,
-            'points': penalty,
-            'question': question['display_question'],
-            'user_answer': user_answer if not is_skip else "SKIPPED",
-            'correct_answer': correct_answer
-        })
+            score = game['score'] + penalty
+            game['score'] = score if score > 0 else 0  # Don't go below 0
+
+        record_history(game, False, answer_time, penalty,
+                       question['display_question'],
+                       user_answer if not is_skip else "SKIPPED", correct_answer)
 
         # Store result for display
         if is_skip:
@@ -352,6 +445,9 @@ def render_setup_screen():
     )
 
     if st.button("🚀 Start Game", type="primary", use_container_width=True):
+        # Start from a clean state: a game ended early may have left a queue
+        # of questions built for other settings
+        reset_game()
         game = st.session_state.binary_game
         game['mode'] = mode
         game['difficulty'] = difficulty
@@ -403,10 +499,10 @@ def render_game_screen():
         # Multiple choice buttons (responsive: 2 cols on desktop, stacks on mobile)
         cols = st.columns(2)
 
-        for idx, choice in enumerate(question['choices']):
+        for idx, (choice, choice_key) in enumerate(zip(question['choices'], CHOICE_KEYS)):
             col = cols[idx % 2]
             # Larger buttons with better mobile touch targets
-            if col.button(choice, key=f"choice_{idx}", use_container_width=True):
+            if col.button(choice, key=choice_key, use_container_width=True):
                 check_answer(choice)
 
                 # Generate next question immediately
@@ -451,27 +547,7 @@ def render_game_screen():
                     st.rerun()
 
         # Auto-focus JavaScript for input field
-        st.components.v1.html("""
-            <script>
-                // Auto-focus the input field after page load
-                window.parent.document.addEventListener('DOMContentLoaded', function() {
-                    setTimeout(function() {
-                        const inputs = window.parent.document.querySelectorAll('input[type="text"]');
-                        if (inputs.length > 0) {
-                            inputs[inputs.length - 1].focus();
-                        }
-                    }, 100);
-                });
-
-                // Also try to focus immediately
-                setTimeout(function() {
-                    const inputs = window.parent.document.querySelectorAll('input[type="text"]');
-                    if (inputs.length > 0) {
-                        inputs[inputs.length - 1].focus();
-                    }
-                }, 100);
-            </script>
-        """, height=0)
+        st.components.v1.html(AUTO_FOCUS_HTML, height=0)
 
     # Quit button (bottom, less prominent)
     st.markdown("<div style='margin-top: 30px;'></div>", unsafe_allow_html=True)
@@ -530,7 +606,7 @@ def _save_game_result_to_db(game: dict, accuracy: float, avg_time: float):
                     "best_streak": game['best_streak'],
                     "avg_time": round(avg_time, 2)
                 },
-                "history": game['history']
+                "history": history_as_records(game)
             }
 
             # Save to database
@@ -551,18 +627,33 @@ def _save_game_result_to_db(game: dict, accuracy: float, avg_time: float):
         st.error(f"❌ Error saving result: {str(e)}")
 
 
+def compute_final_stats(game: dict) -> dict:
+    """Compute the summary stats shown on the results screen"""
+    total = game['total_count']
+    accuracy = (game['correct_count'] / total * 100) if total > 0 else 0
+    emoji, message = get_performance_rating(accuracy)
+    return {
+        'accuracy': accuracy,
+        'avg_time': game['total_answer_time'] / total if total > 0 else 0,
+        'wrong_count': total - game['correct_count'],
+        'emoji': emoji,
+        'message': message
+    }
+
 def render_results_screen():
     """Render game over / results screen"""
     game = st.session_state.binary_game
 
     st.title("🏁 Game Over!")
 
-    # Calculate final stats
-    accuracy = (game['correct_count'] / game['total_count'] * 100) if game['total_count'] > 0 else 0
-    avg_time = sum(h['time'] for h in game['history']) / len(game['history']) if game['history'] else 0
-    emoji, message = get_performance_rating(accuracy)
+    # Final stats are frozen once the game ends, so compute them only once
+    if game.get('final_stats') is None:
+        game['final_stats'] = compute_final_stats(game)
+    final_stats = game['final_stats']
+    accuracy = final_stats['accuracy']
+    avg_time = final_stats['avg_time']
 
-    st.markdown(f"## {emoji} {message}")
+    st.markdown(f"## {final_stats['emoji']} {final_stats['message']}")
 
     # Save to database if user is authenticated
     _save_game_result_to_db(game, accuracy, avg_time)
@@ -582,27 +673,35 @@ def render_results_screen():
     with col4:
         st.metric("Correct", game['correct_count'])
     with col5:
-        st.metric("Wrong", game['total_count'] - game['correct_count'])
+        st.metric("Wrong", final_stats['wrong_count'])
     with col6:
-        avg_time = sum(h['time'] for h in game['history']) / len(game['history']) if game['history'] else 0
         st.metric("Avg Time", f"{avg_time:.1f}s")
 
     # Show detailed history
-    if game['history']:
+    num_answers = len(game['history_correct'])
+    if num_answers:
         with st.expander("📊 Answer History", expanded=False):
-            for idx, entry in enumerate(reversed(game['history']), 1):
-                status = "✅" if entry['correct'] else "❌"
-                result_text = "✓" if entry['correct'] else f"(Correct: `{entry['correct_answer']}`)"
+            entries = zip(
+                reversed(game['history_correct']),
+                reversed(game['history_time']),
+                reversed(game['history_points']),
+                reversed(game['history_question']),
+                reversed(game['history_user_answer']),
+                reversed(game['history_correct_answer'])
+            )
+            for idx, (correct, answer_time, points, question, user_answer, correct_answer) in enumerate(entries, 1):
+                status = "✅" if correct else "❌"
+                result_text = "✓" if correct else f"(Correct: `{correct_answer}`)"
                 col_a, col_b = st.columns([3, 1])
                 with col_a:
                     st.markdown(
-                        f"{status} **Q{len(game['history']) - idx + 1}:** {entry['question']} "
-                        f"→ Your answer: `{entry['user_answer']}` "
+                        f"{status} **Q{num_answers - idx + 1}:** {question} "
+                        f"→ Your answer: `{user_answer}` "
                         f"{result_text}"
                     )
                 with col_b:
-                    points_display = f"+{entry['points']} pts" if entry['correct'] else "0 pts"
-                    st.caption(f"{entry['time']:.1f}s • {points_display}")
+                    points_display = f"+{points} pts" if correct else "0 pts"
+                    st.caption(f"{answer_time:.1f}s • {points_display}")
 
     # Action buttons
     col_retry, col_new = st.columns(2)
@@ -1,8 +1,21 @@
 # tools/games/game_utils.py
 
 import random
+from bisect import bisect_right
+from functools import lru_cache
 from typing import List, Tuple, Dict
 
+import numpy as np
+
+# NumPy generator used for batched draws (one vectorized call per batch)
+_NP_RNG = np.random.default_rng()
+
+# Module-private RNG with its methods bound once, for per-call draws
+_RNG = random.Random()
+_randint = _RNG.randint
+_sample = _RNG.sample
+_choice = _RNG.choice
+
 # Difficulty configurations
 DIFFICULTY_CONFIG = {
     "Easy": {
@@ -35,87 +48,86 @@ DIFFICULTY_CONFIG = {
     }
 }
 
+# (min_val, max_val) for every allowed bit length, per difficulty.
+# MSB is 1 to guarantee the bit length: 2^(n-1) .. 2^n - 1
+_BIT_RANGES = {
+    name: tuple((1 << (bits - 1), (1 << bits) - 1) for bits in range(cfg["bit_min"], cfg["bit_max"] + 1))
+    for name, cfg in DIFFICULTY_CONFIG.items()
+}
+
 def generate_random_number(difficulty: str) -> Tuple[int, str]:
     """
     Generate a random number based on difficulty level.
     Returns (decimal_value, binary_string)
     """
-    config = DIFFICULTY_CONFIG[difficulty]
-    bit_length = random.randint(config["bit_min"], config["bit_max"])
+    # Pick a bit length uniformly, then a number with exactly that many bits
+    min_val, max_val = _choice(_BIT_RANGES[difficulty])
 
-    # Generate random number with specific bit length
-    # Ensure MSB is 1 to guarantee the bit length
-    min_val = 1 << (bit_length - 1)  # 2^(n-1)
-    max_val = (1 << bit_length) - 1  # 2^n - 1
-
-    decimal_val = random.randint(min_val, max_val)
+    decimal_val = _randint(min_val, max_val)
     binary_str = bin(decimal_val)[2:]  # Remove '0b' prefix
 
     return decimal_val, binary_str
 
 def generate_distractors_decimal(correct: int, count: int = 3) -> List[int]:
     """Generate plausible wrong answers for binary→decimal conversion"""
-    distractors = set()
+    bit_length = correct.bit_length()
 
     # Strategy 1: Off-by-one errors
-    distractors.add(correct + 1)
-    distractors.add(correct - 1)
+    candidates = [correct + 1, correct - 1]
 
-    # Strategy 2: Bit flip errors (flip random bit)
-    bit_length = correct.bit_length()
-    for i in range(min(3, bit_length)):
-        distractors.add(correct ^ (1 << random.randint(0, bit_length - 1)))
+    # Strategy 2: Bit flip errors (flip up to 3 distinct random bits)
+    candidates.extend(correct ^ (1 << bit) for bit in _sample(range(bit_length), min(3, bit_length)))
 
     # Strategy 3: Magnitude errors
-    distractors.add(correct * 2)
-    distractors.add(correct // 2)
+    candidates.append(correct * 2)
+    candidates.append(correct // 2)
     if correct > 10:
-        distractors.add(correct + random.randint(5, 15))
-        distractors.add(correct - random.randint(5, 15))
+        candidates.append(correct + _randint(5, 15))
+        candidates.append(correct - _randint(5, 15))
 
-    # Remove negative numbers and the correct answer
-    distractors = {d for d in distractors if d >= 0 and d != correct}
+    # Deduplicate, dropping negative numbers and the correct answer
+    distractors = {d for d in candidates if d >= 0 and d != correct}
 
     # Select random subset
     if len(distractors) < count:
         # Add more random numbers in similar range
         while len(distractors) < count:
-            noise = random.randint(-50, 50)
+            noise = _randint(-50, 50)
             candidate = max(0, correct + noise)
             if candidate != correct:
                 distractors.add(candidate)
 
-    return random.sample(list(distractors), min(count, len(distractors)))
+    return _sample(tuple(distractors), min(count, len(distractors)))
 
 def generate_distractors_binary(correct: str, count: int = 3) -> List[str]:
     """Generate plausible wrong answers for decimal→binary conversion"""
-    distractors = set()
     correct_int = int(correct, 2)
     bit_length = len(correct)
 
-    # Strategy 1: Flip random bits
-    for _ in range(5):
-        flipped = correct_int ^ (1 << random.randint(0, bit_length - 1))
-        distractors.add(bin(flipped)[2:].zfill(bit_length))
+    # Zero-padded to the answer's width (for visual consistency)
+    fmt = f'{{:0{bit_length}b}}'.format
+
+    # Strategy 1: Flip up to 5 distinct random bits
+    candidates = [fmt(correct_int ^ (1 << bit)) for bit in _sample(range(bit_length), min(5, bit_length))]
 
     # Strategy 2: Off-by-one in decimal
-    distractors.add(bin(correct_int + 1)[2:].zfill(bit_length))
-    distractors.add(bin(max(0, correct_int - 1))[2:].zfill(bit_length))
+    candidates.append(fmt(correct_int + 1))
+    candidates.append(fmt(max(0, correct_int - 1)))
 
     # Strategy 3: Swap adjacent bits
     temp = list(correct)
     if len(temp) > 1:
-        idx = random.randint(0, len(temp) - 2)
+        idx = _randint(0, len(temp) - 2)
         temp[idx], temp[idx + 1] = temp[idx + 1], temp[idx]
-        distractors.add(''.join(temp))
+        candidates.append(''.join(temp))
 
-    # Remove correct answer
-    distractors.discard(correct)
+    # Deduplicate, dropping the correct answer
+    distractors = {d for d in candidates if d != correct}
 
-    # Ensure all have same length (for visual consistency)
-    distractors = {d.zfill(bit_length) for d in distractors if d}
+    return _sample(tuple(distractors), min(count, len(distractors)))
 
-    return random.sample(list(distractors), min(count, len(distractors)))
+# Streak multiplier indexed by min(streak, 10): x1.5 from 5, x2.0 from 10
+_STREAK_MULT_TABLE = (1.0,) * 5 + (1.5,) * 5 + (2.0,)
 
 def calculate_score(base_points: int, answer_time: float, streak: int) -> int:
     """
@@ -124,46 +136,26 @@ def calculate_score(base_points: int, answer_time: float, streak: int) -> int:
     - Speed bonus if < 3 seconds
     - Streak multiplier
     """
-    score = base_points
-
-    # Speed bonus
-    if answer_time < 3.0:
-        score += 5
-
-    # Streak multiplier
-    if streak >= 10:
-        score = int(score * 2.0)
-    elif streak >= 5:
-        score = int(score * 1.5)
-
-    return score
-
-def format_time(seconds: float) -> str:
-    """Format time in seconds to readable string"""
-    if seconds < 60:
-        return f"{seconds:.1f}s"
-    else:
-        mins = int(seconds // 60)
-        secs = seconds % 60
-        return f"{mins}m {secs:.1f}s"
+    speed_bonus = 5 if answer_time < 3.0 else 0
+    return int((base_points + speed_bonus) * _STREAK_MULT_TABLE[min(streak, 10)])
+
+# Accuracy tiers: _RATINGS[i] applies from _RATING_THRESHOLDS[i - 1] (inclusive) upwards
+_RATING_THRESHOLDS = (40, 60, 75, 85, 95)
+_RATINGS = (
+    ("💪", "Keep Learning! You'll Get There!"),
+    ("📚", "Not Bad! Room for Improvement!"),
+    ("👍", "Good! Keep Practicing!"),
+    ("🎯", "Great! Strong Performance!"),
+    ("🌟", "Excellent! Binary Expert!"),
+    ("🏆", "Perfect! Master of Binary!"),
+)
 
 def get_performance_rating(accuracy: float) -> Tuple[str, str]:
     """
     Get performance rating based on accuracy.
     Returns (emoji, message)
     """
-    if accuracy >= 95:
-        return "🏆", "Perfect! Master of Binary!"
-    elif accuracy >= 85:
-        return "🌟", "Excellent! Binary Expert!"
-    elif accuracy >= 75:
-        return "🎯", "Great! Strong Performance!"
-    elif accuracy >= 60:
-        return "👍", "Good! Keep Practicing!"
-    elif accuracy >= 40:
-        return "📚", "Not Bad! Room for Improvement!"
-    else:
-        return "💪", "Keep Learning! You'll Get There!"
+    return _RATINGS[bisect_right(_RATING_THRESHOLDS, accuracy)]
 
 # ========================= Speed Binary Addition Utilities =========================
 
@@ -189,61 +181,92 @@ ADDITION_DIFFICULTY_CONFIG = {
     }
 }
 
-def generate_addition_operand(difficulty: str) -> Tuple[int, str]:
+# (min_val, max_val) for every allowed operand bit length, per difficulty.
+# MSB is 1 to guarantee the bit length, except for 1-bit numbers (0 or 1)
+_ADDITION_BIT_RANGES = {
+    name: tuple((0, 1) if bits == 1 else (1 << (bits - 1), (1 << bits) - 1)
+                for bits in range(cfg["bit_min"], cfg["bit_max"] + 1))
+    for name, cfg in ADDITION_DIFFICULTY_CONFIG.items()
+}
+
+@lru_cache(maxsize=8192)
+def to_bin(n: int) -> str:
+    """
+    Binary string of a non-negative integer, without the '0b' prefix.
+    Cached: addition operands and sums stay below 2^13, so every value fits.
+    """
+    return bin(n)[2:]
+
+def generate_addition_operand(difficulty: str, min_value: int = 0) -> Tuple[int, str]:
     """
     Generate a random operand for binary addition based on difficulty.
+    Values below min_value (0 or 1) are raised to it, e.g. min_value=1 excludes zero.
     Returns (decimal_value, binary_string)
     """
-    config = ADDITION_DIFFICULTY_CONFIG[difficulty]
-    bit_length = random.randint(config["bit_min"], config["bit_max"])
-
-    # Generate number with the chosen bit length
-    if bit_length == 1:
-        decimal_val = random.randint(0, 1)
-    else:
-        # Ensure MSB is 1 to guarantee the bit length (except for 1-bit numbers)
-        min_val = 1 << (bit_length - 1)
-        max_val = (1 << bit_length) - 1
-        decimal_val = random.randint(min_val, max_val)
-
-    binary_str = bin(decimal_val)[2:]
+    # Pick a bit length uniformly, then a number with that bit length
+    min_val, max_val = _choice(_ADDITION_BIT_RANGES[difficulty])
+    decimal_val = _randint(max(min_val, min_value), max_val)
+
+    binary_str = to_bin(decimal_val)
     return decimal_val, binary_str
 
-def calculate_binary_addition_with_carries(a: int, b: int) -> Tuple[int, List[int]]:
+def generate_addition_operands(difficulty: str, count: int) -> List[Tuple[int, str]]:
     """
-    Perform binary addition and track carry positions.
+    Generate a batch of random operands in one vectorized draw.
+    Same distribution as generate_addition_operand.
+    Returns list of (decimal_value, binary_string)
+    """
+    config = ADDITION_DIFFICULTY_CONFIG[difficulty]
+    bit_lengths = _NP_RNG.integers(config["bit_min"], config["bit_max"], size=count, endpoint=True)
+
+    # 1-bit operands are 0 or 1; longer ones keep their MSB set
+    min_vals = np.where(bit_lengths == 1, 0, 1 << (bit_lengths - 1))
+    max_vals = (1 << bit_lengths) - 1
+    decimal_vals = _NP_RNG.integers(min_vals, max_vals, endpoint=True).tolist()
+
+    return [(decimal_val, to_bin(decimal_val)) for decimal_val in decimal_vals]
+
+def add_with_carry_mask(a: int, b: int) -> Tuple[int, int]:
+    """
+    Perform binary addition and return the carries as a bitmask.
 
     Args:
         a, b: Decimal integers to add
 
     Returns:
-        (result, carry_positions): Result and list of bit positions where carries occurred
+        (result, carry_mask): Result and mask with bit i set if column i produced a carry
     """
     result = a + b
-    carry_positions = []
 
-    # Simulate binary addition to find carries
-    carry = 0
-    pos = 0
+    # a + b == a ^ b ^ carries_in, so the carry into column i is bit i of
+    # (a ^ b ^ result); shifting right by one gives the carry out of column i
+    return result, (a ^ b ^ result) >> 1
 
-    while a > 0 or b > 0 or carry > 0:
-        bit_a = a & 1
-        bit_b = b & 1
+def calculate_binary_addition_with_carries(a: int, b: int) -> Tuple[int, Tuple[int, ...]]:
+    """
+    Perform binary addition and track carry positions.
 
-        # If we have a carry out from this position
-        if bit_a + bit_b + carry >= 2:
-            carry_positions.append(pos)
-            carry = 1
-        else:
-            carry = 0
+    Args:
+        a, b: Decimal integers to add
 
-        a >>= 1
-        b >>= 1
-        pos += 1
+    Returns:
+        (result, carry_positions): Result and tuple of bit positions where carries occurred
+    """
+    result, carry_mask = add_with_carry_mask(a, b)
+    carry_positions = []
+
+    # Walk only the set bits (lowest first)
+    while carry_mask:
+        low_bit = carry_mask & -carry_mask
+        carry_positions.append(low_bit.bit_length() - 1)
+        carry_mask ^= low_bit
 
-    return result, carry_positions
+    return result, tuple(carry_positions)
 
-def format_carry_visualization(a_bin: str, b_bin: str, result_bin: str, carry_positions: List[int]) -> str:
+# Translation table for carry strings: '0' -> ' ', '1' -> '¹'
+_CARRY_MARKERS = str.maketrans('01', ' ¹')
+
+def format_carry_visualization(a_bin: str, b_bin: str, result_bin: str, carry_positions: Tuple[int, ...]) -> str:
     """
     Format carry visualization for display in results.
 
@@ -251,7 +274,7 @@ def format_carry_visualization(a_bin: str, b_bin: str, result_bin: str, carry_po
         a_bin: First operand in binary (string)
         b_bin: Second operand in binary (string)
         result_bin: Result in binary (string)
-        carry_positions: List of bit positions where carries occurred
+        carry_positions: Bit positions where carries occurred
 
     Returns:
         String with carry markers (e.g., "  ¹ ¹  ")
@@ -262,15 +285,13 @@ def format_carry_visualization(a_bin: str, b_bin: str, result_bin: str, carry_po
     # Find the maximum length needed
     max_len = max(len(a_bin), len(b_bin), len(result_bin))
 
-    # Build carry string from right to left
-    carry_str = [' '] * max_len
+    # Pack positions into a mask, render it as max_len binary digits
+    # (rightmost = position 0) and map 0/1 to space/carry marker
+    carry_mask = 0
     for pos in carry_positions:
-        # Convert position (from right) to index (from left)
-        idx = max_len - 1 - pos
-        if 0 <= idx < max_len:
-            carry_str[idx] = '¹'
+        carry_mask |= 1 << pos
 
-    return ''.join(carry_str)
+    return format(carry_mask, f'0{max_len}b')[-max_len:].translate(_CARRY_MARKERS)
 
 def generate_addition_distractors(correct_result: str, operand_a: int, operand_b: int, count: int = 3) -> List[str]:
     """
@@ -284,45 +305,44 @@ def generate_addition_distractors(correct_result: str, operand_a: int, operand_b
     Returns:
         List of distractor binary strings
     """
-    distractors = set()
     correct_int = int(correct_result, 2)
 
+    candidates = []
+
     # Strategy 1: Wrong carry propagation (most common error)
     # Add without considering all carries properly
     wrong_carry = operand_a ^ operand_b  # XOR gives addition without carry
     if wrong_carry != correct_int and wrong_carry > 0:
-        distractors.add(bin(wrong_carry)[2:])
+        candidates.append(f'{wrong_carry:b}')
 
     # Strategy 2: Off-by-one errors
     if correct_int > 0:
-        distractors.add(bin(correct_int - 1)[2:])
-    distractors.add(bin(correct_int + 1)[2:])
+        candidates.append(f'{correct_int - 1:b}')
+    candidates.append(f'{correct_int + 1:b}')
 
-    # Strategy 3: Bit flip error (flip random bit in correct answer)
-    if len(correct_result) > 0:
-        for _ in range(3):
-            bit_pos = random.randint(0, len(correct_result) - 1)
-            temp_list = list(correct_result)
-            temp_list[bit_pos] = '0' if temp_list[bit_pos] == '1' else '1'
-            distractors.add(''.join(temp_list))
+    # Strategy 3: Bit flip error (flip up to 3 distinct random bits in correct answer,
+    # keeping its width so a flipped MSB shows as a leading zero)
+    width = len(correct_result)
+    if width > 0:
+        fmt = f'{{:0{width}b}}'.format
+        candidates.extend(fmt(correct_int ^ (1 << bit)) for bit in _sample(range(width), min(3, width)))
 
     # Strategy 4: Missing MSB (forgot final carry)
     if len(correct_result) > 1:
-        distractors.add(correct_result[1:])
+        candidates.append(correct_result[1:])
 
     # Strategy 5: Extra bit error
-    distractors.add('1' + correct_result)
+    candidates.append('1' + correct_result)
 
-    # Remove correct answer and empty strings
-    distractors.discard(correct_result)
-    distractors = {d for d in distractors if d and d != '0' * len(d)}
+    # Deduplicate, dropping the correct answer, empty and all-zero strings
+    distractors = {d for d in candidates if d and d != correct_result and d != '0' * len(d)}
 
     # If we don't have enough, add some random variations
     while len(distractors) < count:
-        noise = random.randint(-3, 3)
+        noise = _randint(-3, 3)
         candidate = max(1, correct_int + noise)
         if candidate != correct_int:
-            distractors.add(bin(candidate)[2:])
+            distractors.add(f'{candidate:b}')
 
     # Return random sample
-    return random.sample(list(distractors), min(count, len(distractors)))
+    return _sample(tuple(distractors), min(count, len(distractors)))
@@ -4,16 +4,18 @@ import streamlit as st
 import time
 import random
 import re
+from collections import deque
+from dataclasses import dataclass, fields
 from typing import Optional
 from datetime import datetime
 from .game_utils import (
     ADDITION_DIFFICULTY_CONFIG,
     generate_addition_operand,
+    to_bin,
     calculate_binary_addition_with_carries,
     format_carry_visualization,
     generate_addition_distractors,
     calculate_score,
-    format_time,
     get_performance_rating
 )
 
@@ -21,11 +23,47 @@ from .game_utils import (
 GAME_SLUG = "speed_binary_addition"
 GAME_DISPLAY_NAME = "Speed Binary Addition"
 
+# Questions are pre-built when the game starts; the pool is topped up if a fast player drains it
+QUESTION_POOL_SIZE = 80
+QUESTION_POOL_TOP_UP = 40
+
+# Pattern compiled once at import
+BINARY_INPUT_RE = re.compile(r'^[01]+$')
+
+# Styled <code> tag for binary operands in the question heading
+CODE_HTML = '<code style="background: #f0f0f0; padding: 4px 8px; border-radius: 4px; font-family: monospace; font-size: 18px;">{}</code>'
+
+# Results-screen history: each answer is one flex row, all rows sent in a single markdown call
+HISTORY_ROW_HTML = (
+    '<div style="display: flex; justify-content: space-between; gap: 1rem; margin-bottom: 0.75rem;">'
+    '<div>{status} <strong>Q{q_num}:</strong> <code>{question_text}</code>{carries}<br>{answer}</div>'
+    '<div style="color: #808495; font-size: 14px; white-space: nowrap;">{time:.1f}s • {points}</div>'
+    '</div>'
+)
+HISTORY_CARRIES_HTML = '<br><span style="color: #808495; font-size: 14px;">Carries: <code style="white-space: pre;">{}</code></span>'
+
+@dataclass(slots=True)
+class HistoryEntry:
+    """One answered question, kept for the results screen and the saved record"""
+    correct: bool
+    time: float
+    points: int
+    question_text: str
+    operand_a_bin: str
+    operand_b_bin: str
+    operand_a_dec: int
+    operand_b_dec: int
+    result_bin: str
+    carry_positions: tuple
+    user_answer: str
+    carry_viz: str = ''
+
+HISTORY_FIELDS = tuple(f.name for f in fields(HistoryEntry))
+
 # ========================= JavaScript Timer Component =========================
 
-def render_compact_timer(start_time: float, duration: int = 60) -> None:
-    """Render compact JavaScript timer with progress bar"""
-    html = f"""
+# Static timer markup; only start_time, duration and auto_focus vary between reruns
+TIMER_TEMPLATE = """
     <div id="compact-timer">
         <div id="timer-bar">
             <div id="timer-fill"></div>
@@ -68,6 +106,17 @@ def render_compact_timer(start_time: float, duration: int = 60) -> None:
         }}
 
         updateTimer();
+
+        // Focus the answer input (Direct Input mode) unless it already has focus
+        if ({auto_focus}) {{
+            setTimeout(function() {{
+                const doc = window.parent.document;
+                const inputs = doc.querySelectorAll('input[type="text"]');
+                if (inputs.length > 0 && doc.activeElement !== inputs[inputs.length - 1]) {{
+                    inputs[inputs.length - 1].focus();
+                }}
+            }}, 100);
+        }}
     </script>
     <style>
         #compact-timer {{
@@ -105,36 +154,21 @@ def render_compact_timer(start_time: float, duration: int = 60) -> None:
         }}
     </style>
     """
+
+def render_compact_timer(start_time: float, duration: int = 60, auto_focus: bool = False) -> None:
+    """Render compact JavaScript timer with progress bar (optionally focusing the answer input)"""
+    html = TIMER_TEMPLATE.format(
+        start_time=start_time,
+        duration=duration,
+        auto_focus='true' if auto_focus else 'false'
+    )
     st.components.v1.html(html, height=50)
 
 # ========================= Game State Management =========================
 
-def init_game_state():
-    """Initialize game state in session_state"""
-    if 'addition_game' not in st.session_state:
-        st.session_state.addition_game = {
-            'active': False,
-            'difficulty': None,
-            'input_type': None,
-            'start_time': None,
-            'duration': 60,
-            'current_question': None,
-            'question_start_time': None,
-            'score': 0,
-            'streak': 0,
-            'best_streak': 0,
-            'correct_count': 0,
-            'total_count': 0,
-            'history': [],
-            'last_result': None,
-            'result_saved': False,
-            'stats_recorded': False,  # Track if stats have been recorded
-            'last_decimal_question': -10  # Track when last decimal question was shown
-        }
-
-def reset_game():
-    """Reset game state"""
-    st.session_state.addition_game = {
+def _fresh_game_state() -> dict:
+    """Return a new game state dict with default values"""
+    return {
         'active': False,
         'difficulty': None,
         'input_type': None,
@@ -148,12 +182,28 @@ def reset_game():
         'correct_count': 0,
         'total_count': 0,
         'history': [],
+        'total_answer_time': 0.0,  # Running sum of answer times (for avg time)
         'last_result': None,
+        'stats_key': None,  # (score, total_count, streak) behind stats_html
+        'stats_html': '',  # Last rendered scoreboard line
         'result_saved': False,
         'stats_recorded': False,  # Track if stats have been recorded
-        'last_decimal_question': -10
+        'recorded_anonymous': False,  # Stats recorded for a signed-out player
+        'last_decimal_question': -10,  # Track when last decimal question was shown
+        'question_queue': deque(),  # Pre-built upcoming questions
+        'questions_built': 0,  # Number of questions built so far
+        'question_token': 0  # Advances with every question shown (scopes answer widgets)
     }
 
+def init_game_state():
+    """Initialize game state in session_state"""
+    if 'addition_game' not in st.session_state:
+        st.session_state.addition_game = _fresh_game_state()
+
+def reset_game():
+    """Reset game state"""
+    st.session_state.addition_game = _fresh_game_state()
+
 def is_game_active() -> bool:
     """Check if game is still active (within time limit + grace period)"""
     game = st.session_state.addition_game
@@ -166,55 +216,51 @@ def is_game_active() -> bool:
 
 # ========================= Question Generation =========================
 
-def generate_question():
-    """Generate a new addition question (binary+binary or binary+decimal)"""
-    game = st.session_state.addition_game
+def _build_question(game: dict) -> dict:
+    """Build one addition question (binary+binary or binary+decimal)"""
     difficulty = game['difficulty']
 
     # Generate two random operands (ensure both > 0)
-    operand_a_dec, operand_a_bin = generate_addition_operand(difficulty)
-    operand_b_dec, operand_b_bin = generate_addition_operand(difficulty)
-
-    # Ensure no zero operands
-    while operand_a_dec == 0:
-        operand_a_dec, operand_a_bin = generate_addition_operand(difficulty)
-    while operand_b_dec == 0:
-        operand_b_dec, operand_b_bin = generate_addition_operand(difficulty)
+    operand_a_dec, operand_a_bin = generate_addition_operand(difficulty, min_value=1)
+    operand_b_dec, operand_b_bin = generate_addition_operand(difficulty, min_value=1)
 
     # Calculate result with carry tracking
     result_dec, carry_positions = calculate_binary_addition_with_carries(operand_a_dec, operand_b_dec)
-    result_bin = bin(result_dec)[2:]
+    result_bin = to_bin(result_dec)
 
     # Determine question type: only show decimal if at least 5 questions since last decimal
     # Also avoid showing 1 in base 10 (trivial and confusing)
-    questions_since_decimal = game['total_count'] - game['last_decimal_question']
+    question_index = game['questions_built']
+    questions_since_decimal = question_index - game['last_decimal_question']
     can_show_decimal = questions_since_decimal >= 5 and operand_b_dec > 1
 
     if can_show_decimal and random.random() < 0.25:
         # Show binary+decimal question
         question_type = 'binary_decimal'
-        game['last_decimal_question'] = game['total_count']
+        game['last_decimal_question'] = question_index
     else:
         # Show binary+binary question
         question_type = 'binary_binary'
 
     if question_type == 'binary_binary':
         # Both operands shown in binary
-        display_question = f"`{operand_a_bin}` + `{operand_b_bin}` = ?"
+        display_question_html = f"{CODE_HTML.format(operand_a_bin)} + {CODE_HTML.format(operand_b_bin)} = ?"
         question_text = f"{operand_a_bin} + {operand_b_bin}"
     else:
         # Second operand shown in decimal with subscript
-        display_question = f"`{operand_a_bin}` + {operand_b_dec}<sub>10</sub> = ?"
+        display_question_html = f"{CODE_HTML.format(operand_a_bin)} + {operand_b_dec}<sub>10</sub> = ?"
         question_text = f"{operand_a_bin} + {operand_b_dec}₁₀"
 
     # Generate multiple choice options if needed
     choices = None
     if game['input_type'] == 'Multiple Choice':
         distractors = generate_addition_distractors(result_bin, operand_a_dec, operand_b_dec, count=3)
-        choices = [result_bin] + distractors
-        random.shuffle(choices)
+        # Insert the correct answer at a uniformly random position
+        choices = list(distractors)
+        choices.insert(random.randint(0, len(choices)), result_bin)
 
-    game['current_question'] = {
+    game['questions_built'] += 1
+    return {
         'type': question_type,
         'operand_a_dec': operand_a_dec,
         'operand_a_bin': operand_a_bin,
@@ -223,11 +269,28 @@ def generate_question():
         'result_dec': result_dec,
         'result_bin': result_bin,
         'carry_positions': carry_positions,
-        'display_question': display_question,
+        'display_question_html': display_question_html,
         'question_text': question_text,
         'choices': choices
     }
+
+def _prefill_question_pool(game: dict, n: int = QUESTION_POOL_SIZE):
+    """Append n fully built questions (including choices) to the question pool"""
+    queue = game['question_queue']
+    for _ in range(n):
+        queue.append(_build_question(game))
+
+def generate_question():
+    """Advance to the next pre-built question"""
+    game = st.session_state.addition_game
+
+    # Top up lazily if a fast player drained the pool
+    if not game['question_queue']:
+        _prefill_question_pool(game, QUESTION_POOL_TOP_UP)
+
+    game['current_question'] = game['question_queue'].popleft()
     game['question_start_time'] = time.time()
+    game['question_token'] += 1
 
 # ========================= Answer Checking =========================
 
@@ -245,8 +308,17 @@ def check_answer(user_answer: str) -> bool:
     # Calculate answer time
     answer_time = time.time() - game['question_start_time']
 
+    # Carry markers for the results screen, built once per answer
+    carry_viz = format_carry_visualization(
+        question['operand_a_bin'],
+        question['operand_b_bin'],
+        question['result_bin'],
+        question['carry_positions']
+    )
+
     # Update stats
     game['total_count'] += 1
+    game['total_answer_time'] += answer_time
 
     if is_correct:
         game['correct_count'] += 1
@@ -258,21 +330,6 @@ def check_answer(user_answer: str) -> bool:
         points = calculate_score(base_points, answer_time, game['streak'])
         game['score'] += points
 
-        # Record history
-        game['history'].append({
-            'correct': True,
-            'time': answer_time,
-            'points': points,
-            'question_text': question['question_text'],
-            'operand_a_bin': question['operand_a_bin'],
-            'operand_b_bin': question['operand_b_bin'],
-            'operand_a_dec': question['operand_a_dec'],
-            'operand_b_dec': question['operand_b_dec'],
-            'result_bin': question['result_bin'],
-            'carry_positions': question['carry_positions'],
-            'user_answer': user_answer
-        })
-
         # Store result for display
         game['last_result'] = {
             'is_correct': True,
@@ -287,20 +344,7 @@ def check_answer(user_answer: str) -> bool:
         if game['difficulty'] == 'Expert' and game['input_type'] == 'Multiple Choice':
             penalty = -10
             game['score'] = max(0, game['score'] + penalty)
-
-        game['history'].append({
-            'correct': False,
-            'time': answer_time,
-            'points': penalty,
-            'question_text': question['question_text'],
-            'operand_a_bin': question['operand_a_bin'],
-            'operand_b_bin': question['operand_b_bin'],
-            'operand_a_dec': question['operand_a_dec'],
-            'operand_b_dec': question['operand_b_dec'],
-            'result_bin': question['result_bin'],
-            'carry_positions': question['carry_positions'],
-            'user_answer': user_answer
-        })
+        points = penalty
 
         # Store result for display
         penalty_text = f' ({penalty} points)' if penalty < 0 else ''
@@ -310,10 +354,37 @@ def check_answer(user_answer: str) -> bool:
             'correct_answer': correct_answer
         }
 
+    # Record history
+    game['history'].append(HistoryEntry(
+        correct=is_correct,
+        time=answer_time,
+        points=points,
+        question_text=question['question_text'],
+        operand_a_bin=question['operand_a_bin'],
+        operand_b_bin=question['operand_b_bin'],
+        operand_a_dec=question['operand_a_dec'],
+        operand_b_dec=question['operand_b_dec'],
+        result_bin=question['result_bin'],
+        carry_positions=question['carry_positions'],
+        user_answer=user_answer,
+        carry_viz=carry_viz
+    ))
+
     return is_correct
 
 # ========================= UI Components =========================
 
+@st.cache_data
+def _difficulty_info_markdown(difficulty: str) -> tuple[str, Optional[str]]:
+    """Build the setup-screen difficulty info and the optional Expert warning"""
+    config = ADDITION_DIFFICULTY_CONFIG[difficulty]
+    info_md = f"**{difficulty}**: {config['description']} • {config['points']} points per correct answer"
+    warning_html = None
+    if difficulty == "Expert":
+        warning_html = '<p style="color: #ff4444; font-weight: bold;">⚠️ Expert Mode: Wrong answers in Multiple Choice = -10 points</p>'
+    return info_md, warning_html
+
+
 def render_setup_screen():
     """Render game setup screen"""
     st.title("🎮 Speed Binary Addition")
@@ -351,25 +422,48 @@ def render_setup_screen():
             help="Direct input is faster but more challenging"
         )
 
-    # Show difficulty info
-    config = ADDITION_DIFFICULTY_CONFIG[difficulty]
-    st.info(f"**{difficulty}**: {config['description']} • {config['points']} points per correct answer")
-
-    # Show Expert mode warning
-    if difficulty == "Expert":
-        st.markdown('<p style="color: #ff4444; font-weight: bold;">⚠️ Expert Mode: Wrong answers in Multiple Choice = -10 points</p>', unsafe_allow_html=True)
+    # Show difficulty info and Expert mode warning
+    info_md, warning_html = _difficulty_info_markdown(difficulty)
+    st.info(info_md)
+    if warning_html:
+        st.markdown(warning_html, unsafe_allow_html=True)
 
     if st.button("🚀 Start Game", type="primary", use_container_width=True):
+        # Start from a clean state: a game ended early may have left a queue
+        # of questions built for other settings
+        reset_game()
         game = st.session_state.addition_game
         game['difficulty'] = difficulty
         game['input_type'] = input_type
         game['active'] = True
+        _prefill_question_pool(game)
         game['start_time'] = time.time()
         generate_question()
         st.rerun()
 
+def _stats_html(game: dict) -> str:
+    """Scoreboard line, rebuilt only when score, question number or streak change"""
+    stats_key = (game['score'], game['total_count'], game['streak'])
+    if game['stats_key'] != stats_key:
+        stats_text = f"💰 <b>{game['score']} pts</b> | 📝 <b>Q{game['total_count'] + 1}</b>"
+        if game['streak'] > 0:
+            stats_text += f" | 🔥 {game['streak']}"
+        game['stats_html'] = f"<div style='text-align: center; font-size: 16px; margin-bottom: 10px;'>{stats_text}</div>"
+        game['stats_key'] = stats_key
+    return game['stats_html']
+
+def _advance_or_end(game: dict):
+    """After an answer: show the next question, or end the game if time is up"""
+    if is_game_active():
+        generate_question()
+        st.rerun(scope="fragment")
+    else:
+        game['active'] = False
+        st.rerun()
+
+@st.fragment
 def render_game_screen():
-    """Render active game screen"""
+    """Render active game screen (as a fragment: answering reruns only this screen)"""
     game = st.session_state.addition_game
 
     # Check if time is up
@@ -379,15 +473,11 @@ def render_game_screen():
         return
 
     # Display timer
-    render_compact_timer(game['start_time'], game['duration'])
+    render_compact_timer(game['start_time'], game['duration'],
+                         auto_focus=game['input_type'] == 'Direct Input')
 
     # Display stats in one line
-    streak_display = f"🔥 {game['streak']}" if game['streak'] > 0 else ""
-    stats_text = f"💰 <b>{game['score']} pts</b> | 📝 <b>Q{game['total_count'] + 1}</b>"
-    if streak_display:
-        stats_text += f" | {streak_display}"
-
-    st.markdown(f"<div style='text-align: center; font-size: 16px; margin-bottom: 10px;'>{stats_text}</div>", unsafe_allow_html=True)
+    st.markdown(_stats_html(game), unsafe_allow_html=True)
 
     # Display last answer result
     if game['last_result']:
@@ -398,31 +488,21 @@ def render_game_screen():
 
     # Display current question
     question = game['current_question']
-    # Convert markdown backticks to HTML
-    display_question = re.sub(
-        r'`([^`]+)`',
-        r'<code style="background: #f0f0f0; padding: 4px 8px; border-radius: 4px; font-family: monospace; font-size: 18px;">\1</code>',
-        question['display_question']
-    )
-    st.markdown(f"<h2 style='text-align: center; margin: 20px 0;'>{display_question}</h2>", unsafe_allow_html=True)
+    st.markdown(f"<h2 style='text-align: center; margin: 20px 0;'>{question['display_question_html']}</h2>", unsafe_allow_html=True)
 
     # Input based on type
     if game['input_type'] == 'Multiple Choice':
         # Multiple choice buttons (2 columns)
         cols = st.columns(2)
 
+        # Keys are tied to the question, so a stale double-click on the previous
+        # question's buttons is dropped instead of answering this one
+        token = game['question_token']
         for idx, choice in enumerate(question['choices']):
             col = cols[idx % 2]
-            if col.button(choice, key=f"choice_{idx}", use_container_width=True):
+            if col.button(choice, key=f"choice_{token}_{idx}", use_container_width=True):
                 check_answer(choice)
-
-                # Generate next question immediately
-                if is_game_active():
-                    generate_question()
-                    st.rerun()
-                else:
-                    game['active'] = False
-                    st.rerun()
+                _advance_or_end(game)
     else:
         # Direct input
         with st.form(key='answer_form', clear_on_submit=True):
@@ -436,30 +516,12 @@ def render_game_screen():
 
             if submitted and user_answer:
                 # Validate binary input (only 0s and 1s)
-                if re.match(r'^[01]+$', user_answer):
+                if BINARY_INPUT_RE.match(user_answer):
                     check_answer(user_answer)
-
-                    if is_game_active():
-                        generate_question()
-                        st.rerun()
-                    else:
-                        game['active'] = False
-                        st.rerun()
+                    _advance_or_end(game)
                 else:
                     st.error("❌ Invalid input! Please enter only 0s and 1s.")
 
-        # Auto-focus JavaScript
-        st.components.v1.html("""
-            <script>
-                setTimeout(function() {
-                    const inputs = window.parent.document.querySelectorAll('input[type="text"]');
-                    if (inputs.length > 0) {
-                        inputs[inputs.length - 1].focus();
-                    }
-                }, 100);
-            </script>
-        """, height=0)
-
     # Quit button
     st.markdown("<div style='margin-top: 30px;'></div>", unsafe_allow_html=True)
     col1, col2, col3 = st.columns([1, 2, 1])
@@ -468,8 +530,44 @@ def render_game_screen():
             game['active'] = False
             st.rerun()
 
+def _history_to_soa(history: list) -> dict:
+    """Column-wise history for storage: one list per HistoryEntry field, in answer order"""
+    return {name: [getattr(entry, name) for entry in history] for name in HISTORY_FIELDS}
+
+def _build_game_data(game: dict, user: dict, accuracy: float, avg_time: float) -> dict:
+    """Assemble the game record stored in Firebase"""
+    return {
+        "game_slug": GAME_SLUG,
+        "game_type": GAME_DISPLAY_NAME,
+        "timestamp": datetime.utcnow().isoformat(),
+        "user_email": user.get('email', ''),
+        "user_display_name": user.get('display_name', ''),
+        "settings": {
+            "difficulty": game['difficulty'],
+            "input_type": game['input_type'],
+            "duration": game['duration']
+        },
+        "results": {
+            "score": game['score'],
+            "accuracy": round(accuracy, 1),
+            "correct_count": game['correct_count'],
+            "total_count": game['total_count'],
+            "best_streak": game['best_streak'],
+            "avg_time": round(avg_time, 2)
+        },
+        "history": _history_to_soa(game['history'])
+    }
+
 def _save_game_result_to_db(game: dict, accuracy: float, avg_time: float):
     """Save game result to Firebase database if user is authenticated"""
+    # Nothing left to do on reruns of the results screen once the result is
+    # saved or the anonymous play has been recorded
+    if game.get('result_saved'):
+        return
+    if game.get('recorded_anonymous'):
+        st.info("💡 **Sign in to save your score and appear on the leaderboard!**")
+        return
+
     try:
         from firebase import get_current_user, save_game_result, record_game_played
 
@@ -482,36 +580,9 @@ def _save_game_result_to_db(game: dict, accuracy: float, avg_time: float):
             game['stats_recorded'] = True
 
         if is_authenticated:
-            # Check if already saved
-            if 'result_saved' in game and game['result_saved']:
-                return
-
-            # Prepare game data
-            game_data = {
-                "game_slug": GAME_SLUG,
-                "game_type": GAME_DISPLAY_NAME,
-                "timestamp": datetime.utcnow().isoformat(),
-                "user_email": user.get('email', ''),
-                "user_display_name": user.get('display_name', ''),
-                "settings": {
-                    "difficulty": game['difficulty'],
-                    "input_type": game['input_type'],
-                    "duration": game['duration']
-                },
-                "results": {
-                    "score": game['score'],
-                    "accuracy": round(accuracy, 1),
-                    "correct_count": game['correct_count'],
-                    "total_count": game['total_count'],
-                    "best_streak": game['best_streak'],
-                    "avg_time": round(avg_time, 2)
-                },
-                "history": game['history']
-            }
-
             # Save to database
             user_uid = user.get('uid')
-            success = save_game_result(user_uid, GAME_SLUG, game_data)
+            success = save_game_result(user_uid, GAME_SLUG, _build_game_data(game, user, accuracy, avg_time))
 
             if success:
                 st.success("✅ **Score saved to leaderboard!**")
@@ -519,6 +590,7 @@ def _save_game_result_to_db(game: dict, accuracy: float, avg_time: float):
             else:
                 st.warning("⚠️ Failed to save score. Please try again.")
         else:
+            game['recorded_anonymous'] = True
             st.info("💡 **Sign in to save your score and appear on the leaderboard!**")
 
     except Exception as e:
@@ -532,13 +604,13 @@ def render_results_screen():
 
     # Calculate final stats
     accuracy = (game['correct_count'] / game['total_count'] * 100) if game['total_count'] > 0 else 0
-    avg_time = sum(h['time'] for h in game['history']) / len(game['history']) if game['history'] else 0
+    avg_time = game['total_answer_time'] / game['total_count'] if game['total_count'] > 0 else 0
     emoji, message = get_performance_rating(accuracy)
 
     st.markdown(f"## {emoji} {message}")
 
-    # Save to database
-    _save_game_result_to_db(game, accuracy, avg_time)
+    # Save status shows here, but the save runs once the stats are on screen
+    save_status = st.empty()
 
     # Display final stats
     col1, col2, col3 = st.columns(3)
@@ -559,41 +631,40 @@ def render_results_screen():
     with col6:
         st.metric("Avg Time", f"{avg_time:.1f}s")
 
+    # Save to database
+    with save_status.container():
+        _save_game_result_to_db(game, accuracy, avg_time)
+
     # Show detailed history with carry visualization
-    if game['history']:
-        with st.expander("📊 Answer History", expanded=False):
-            for idx, entry in enumerate(reversed(game['history']), 1):
-                status = "✅" if entry['correct'] else "❌"
-
-                # Format the question display
-                q_num = len(game['history']) - idx + 1
-
-                # Build carry visualization
-                carry_viz = format_carry_visualization(
-                    entry['operand_a_bin'],
-                    entry['operand_b_bin'],
-                    entry['result_bin'],
-                    entry['carry_positions']
-                )
-
-                # Display entry
-                col_a, col_b = st.columns([3, 1])
-                with col_a:
-                    # Show carry markers if there are any
-                    if carry_viz.strip():
-                        st.markdown(f"{status} **Q{q_num}:** `{entry['question_text']}`")
-                        st.caption(f"Carries: `{carry_viz}`")
-                    else:
-                        st.markdown(f"{status} **Q{q_num}:** `{entry['question_text']}`")
-
-                    if entry['correct']:
-                        st.markdown(f"Your answer: `{entry['user_answer']}` ✓")
-                    else:
-                        st.markdown(f"Your answer: `{entry['user_answer']}` → Correct: `{entry['result_bin']}`")
-
-                with col_b:
-                    points_display = f"+{entry['points']} pts" if entry['correct'] else (f"{entry['points']} pts" if entry['points'] < 0 else "0 pts")
-                    st.caption(f"{entry['time']:.1f}s • {points_display}")
+    # (a checkbox rather than an expander, so collapsed history costs nothing on reruns)
+    if game['history'] and st.checkbox("📊 Show Answer History", value=False, key='addition_show_history'):
+        rows = []
+        for idx, entry in enumerate(reversed(game['history']), 1):
+            q_num = len(game['history']) - idx + 1
+
+            # Show carry markers if there are any
+            carries = HISTORY_CARRIES_HTML.format(entry.carry_viz) if entry.carry_viz.strip() else ''
+
+            if entry.correct:
+                status = "✅"
+                answer = f"Your answer: <code>{entry.user_answer}</code> ✓"
+                points_display = f"+{entry.points} pts"
+            else:
+                status = "❌"
+                answer = f"Your answer: <code>{entry.user_answer}</code> → Correct: <code>{entry.result_bin}</code>"
+                points_display = f"{entry.points} pts" if entry.points < 0 else "0 pts"
+
+            rows.append(HISTORY_ROW_HTML.format(
+                status=status,
+                q_num=q_num,
+                question_text=entry.question_text,
+                carries=carries,
+                answer=answer,
+                time=entry.time,
+                points=points_display
+            ))
+
+        st.markdown(''.join(rows), unsafe_allow_html=True)
 
     # Action buttons
     col_retry, col_new = st.columns(2)
@@ -607,6 +678,7 @@ def render_results_screen():
             game['difficulty'] = difficulty
             game['input_type'] = input_type
             game['active'] = True
+            _prefill_question_pool(game)
             game['start_time'] = time.time()
             generate_question()
             st.rerun()
@@ -10,7 +10,6 @@ from .game_utils import (
     ADDITION_DIFFICULTY_CONFIG,
     generate_addition_operand,
     calculate_score,
-    format_time,
     get_performance_rating
 )
 
@@ -1,17 +1,23 @@
 # tools/gray_code_converter.py
 
 import streamlit as st
-from typing import Tuple, List, Optional
+from typing import Iterable, Iterator, Tuple, Optional
 
 # ========================= Core Logic =========================
 
-def binary_to_gray(binary_str: str) -> Tuple[str, List[str]]:
+def _gray_of(value: int) -> int:
+    """Gray code of a non-negative integer: value XOR (value >> 1)."""
+    return value ^ (value >> 1)
+
+def _binary_to_gray_fast(binary_str: str) -> str:
+    """Gray code of a validated binary string, same width, without explanation steps."""
+    return format(_gray_of(int(binary_str, 2)), f'0{len(binary_str)}b')
+
+def binary_to_gray(binary_str: str) -> Tuple[str, Iterable[str]]:
     """
     Convert binary to Gray code: Gray = Binary XOR (Binary >> 1)
-    Returns (gray_code, explanation_steps)
+    Returns (gray_code, explanation_steps); the steps are generated lazily
     """
-    explanation = []
-
     # Validate binary string
     if not binary_str or not all(c in '01' for c in binary_str):
         return "", ["Error: Input must be a binary string (0s and 1s only)"]
@@ -19,51 +25,42 @@ def binary_to_gray(binary_str: str) -> Tuple[str, List[str]]:
     # Keep the original length (don't strip leading zeros)
     n = len(binary_str)
 
-    explanation.append("### Step 1: Input Binary Number")
-    explanation.append(f"Binary: `{binary_str}` ({n} bits)")
-
     # Compute Binary >> 1 (right shift by 1)
     shifted = '0' + binary_str[:-1]
-    explanation.append("### Step 2: Right Shift by 1 Position")
-    explanation.append(f"Original:  `{binary_str}`")
-    explanation.append(f"Shifted:   `{shifted}`")
-    explanation.append("(Insert 0 at the left, drop the rightmost bit)")
-
-    # Compute XOR bit by bit
-    explanation.append("### Step 3: XOR Operation (bit by bit)")
-
-    gray_bits = []
-    xor_details = []
-    for i in range(n):
-        b1 = int(binary_str[i])
-        b2 = int(shifted[i])
-        g = b1 ^ b2
-        gray_bits.append(str(g))
-        xor_details.append(f"{b1} ⊕ {b2} = {g}")
-
-    gray_str = ''.join(gray_bits)
-
-    # Build the entire code block as one string
-    xor_block = f"Binary:  {binary_str}\n"
-    xor_block += f"Shifted: {shifted}\n"
-    xor_block += f"         {'-' * n}\n"
-    xor_block += f"Gray:    {gray_str}"
-    explanation.append(f"```\n{xor_block}\n```")
-
-    explanation.append("### Step 4: Bit-by-Bit XOR Details")
-    for i, detail in enumerate(xor_details):
-        explanation.append(f"- Position {i}: {detail}")
-
-    return gray_str, explanation
-
-def gray_to_binary(gray_str: str) -> Tuple[str, List[str]]:
+
+    # One integer XOR for the whole number, formatted back to the input width
+    gray_str = _binary_to_gray_fast(binary_str)
+
+    def _steps() -> Iterator[str]:
+        yield "### Step 1: Input Binary Number"
+        yield f"Binary: `{binary_str}` ({n} bits)"
+
+        yield "### Step 2: Right Shift by 1 Position"
+        yield f"Original:  `{binary_str}`"
+        yield f"Shifted:   `{shifted}`"
+        yield "(Insert 0 at the left, drop the rightmost bit)"
+
+        yield "### Step 3: XOR Operation (bit by bit)"
+
+        # Build the entire code block as one string
+        xor_block = f"Binary:  {binary_str}\n"
+        xor_block += f"Shifted: {shifted}\n"
+        xor_block += f"         {'-' * n}\n"
+        xor_block += f"Gray:    {gray_str}"
+        yield f"```\n{xor_block}\n```"
+
+        yield "### Step 4: Bit-by-Bit XOR Details"
+        for i, (b1, b2, g) in enumerate(zip(binary_str, shifted, gray_str)):
+            yield f"- Position {i}: {b1} ⊕ {b2} = {g}"
+
+    return gray_str, _steps()
+
+def gray_to_binary(gray_str: str) -> Tuple[str, Iterable[str]]:
     """
     Convert Gray code to binary.
     Binary[i] = Gray[i] XOR Binary[i-1], where Binary[0] = Gray[0]
-    Returns (binary_code, explanation_steps)
+    Returns (binary_code, explanation_steps); the steps are generated lazily
     """
-    explanation = []
-
     # Validate Gray string
     if not gray_str or not all(c in '01' for c in gray_str):
         return "", ["Error: Input must be a Gray code string (0s and 1s only)"]
@@ -71,30 +68,31 @@ def gray_to_binary(gray_str: str) -> Tuple[str, List[str]]:
     # Keep the original length (don't strip leading zeros)
     n = len(gray_str)
 
-    explanation.append("### Step 1: Input Gray Code")
-    explanation.append(f"Gray: `{gray_str}` ({n} bits)")
+    # Prefix XOR over all bits: v ^= v >> 1, v >> 2, v >> 4, ... (log2(n) steps)
+    value = int(gray_str, 2)
+    shift = 1
+    while shift < n:
+        value ^= value >> shift
+        shift <<= 1
+    binary_str = format(value, f'0{n}b')
 
-    explanation.append("### Step 2: Decode to Binary")
-    explanation.append("Rule: `Binary[i] = Gray[i] ⊕ Binary[i-1]`")
-    explanation.append(f"Start with `Binary[0] = Gray[0] = {gray_str[0]}`")
+    def _steps() -> Iterator[str]:
+        yield "### Step 1: Input Gray Code"
+        yield f"Gray: `{gray_str}` ({n} bits)"
 
-    binary_bits = [gray_str[0]]
-    explanation.append("### Step 3: Compute Each Bit")
-    explanation.append(f"- Bit 0: Binary[0] = Gray[0] = `{gray_str[0]}`")
+        yield "### Step 2: Decode to Binary"
+        yield "Rule: `Binary[i] = Gray[i] ⊕ Binary[i-1]`"
+        yield f"Start with `Binary[0] = Gray[0] = {gray_str[0]}`"
 
-    for i in range(1, n):
-        prev_binary = int(binary_bits[i-1])
-        gray_bit = int(gray_str[i])
-        binary_bit = prev_binary ^ gray_bit
-        binary_bits.append(str(binary_bit))
-        explanation.append(f"- Bit {i}: Binary[{i}] = Gray[{i}] ⊕ Binary[{i-1}] = {gray_bit} ⊕ {prev_binary} = `{binary_bit}`")
+        yield "### Step 3: Compute Each Bit"
+        yield f"- Bit 0: Binary[0] = Gray[0] = `{gray_str[0]}`"
+        for i in range(1, n):
+            yield f"- Bit {i}: Binary[{i}] = Gray[{i}] ⊕ Binary[{i-1}] = {gray_str[i]} ⊕ {binary_str[i-1]} = `{binary_str[i]}`"
 
-    binary_str = ''.join(binary_bits)
+        yield "### Step 4: Result"
+        yield f"Binary: `{binary_str}`"
 
-    explanation.append("### Step 4: Result")
-    explanation.append(f"Binary: `{binary_str}`")
-
-    return binary_str, explanation
+    return binary_str, _steps()
 
 def decimal_to_binary_str(decimal_val: int, min_bits: int = 4) -> str:
     """Convert decimal to binary string with minimum bit width."""
@@ -185,19 +183,22 @@ def render() -> None:
             else:
                 # Show parsed input if it was decimal
                 if input_str.strip() != binary_str:
-                    decimal_val = int(binary_str, 2)
                     st.info(f"Parsed as decimal `{input_str}` = binary `{binary_str}`")
 
                 gray_str, explanation = binary_to_gray(binary_str)
 
                 if gray_str:
+                    # Parse once; the neighbour checks below work on these ints
+                    decimal_val = int(binary_str, 2)
+                    n_bits = len(binary_str)
+                    gray_int = _gray_of(decimal_val)
+
                     st.subheader("Result")
 
                     col_a, col_b = st.columns(2)
                     with col_a:
                         st.markdown(f"**Binary:**")
                         st.code(binary_str, language=None)
-                        decimal_val = int(binary_str, 2)
                         st.caption(f"Decimal: {decimal_val}")
 
                     with col_b:
@@ -214,17 +215,17 @@ def render() -> None:
                     st.caption("Gray code ensures adjacent values differ by exactly one bit:")
 
                     # Show a few adjacent values
-                    decimal_val = int(binary_str, 2)
                     if decimal_val > 0:
-                        prev_binary = decimal_to_binary_str(decimal_val - 1, len(binary_str))
-                        prev_gray, _ = binary_to_gray(prev_binary)
-                        diff_prev = sum(1 for i in range(len(gray_str)) if i < len(prev_gray) and gray_str[i] != prev_gray[i])
+                        prev_gray_int = _gray_of(decimal_val - 1)
+                        prev_gray = format(prev_gray_int, f'0{n_bits}b')
+                        # Differing bits = popcount of the XOR
+                        diff_prev = (gray_int ^ prev_gray_int).bit_count()
                         st.markdown(f"- Gray({decimal_val-1}) = `{prev_gray}` → Gray({decimal_val}) = `{gray_str}` (differs in {diff_prev} bit)")
 
-                    if decimal_val < 2**len(binary_str) - 1:
-                        next_binary = decimal_to_binary_str(decimal_val + 1, len(binary_str))
-                        next_gray, _ = binary_to_gray(next_binary)
-                        diff_next = sum(1 for i in range(len(gray_str)) if i < len(next_gray) and gray_str[i] != next_gray[i])
+                    if decimal_val < (1 << n_bits) - 1:
+                        next_gray_int = _gray_of(decimal_val + 1)
+                        next_gray = format(next_gray_int, f'0{n_bits}b')
+                        diff_next = (gray_int ^ next_gray_int).bit_count()
                         st.markdown(f"- Gray({decimal_val}) = `{gray_str}` → Gray({decimal_val+1}) = `{next_gray}` (differs in {diff_next} bit)")
                 else:
                     for step in explanation:
@@ -275,7 +276,7 @@ def render() -> None:
 
                     # Verification: convert back
                     st.markdown("### ✓ Verification: Round-trip Conversion")
-                    verify_gray, _ = binary_to_gray(binary_str)
+                    verify_gray = _binary_to_gray_fast(binary_str)
                     if verify_gray == gray_input.lstrip('0') or '0':
                         st.success(f"Binary `{binary_str}` converts back to Gray `{verify_gray}` ✓")
                     else:
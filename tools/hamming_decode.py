@@ -19,21 +19,25 @@
 
 import streamlit as st
 import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 
 # ---------- Utilities (shared style with encoder) ----------
 
+# Digit → subscript translation table, built once per process
+_SUB_TRANS = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+
 def _to_subscript(s: object) -> str:
-    SUBSCRIPT_MAP = {
-        '0': '₀', '1': '₁', '2': '₂', '3': '₃', '4': '₄',
-        '5': '₅', '6': '₆', '7': '₇', '8': '₈', '9': '₉'
-    }
-    return "".join(SUBSCRIPT_MAP.get(ch, ch) for ch in str(s))
+    return str(s).translate(_SUB_TRANS)
 
 def _binary_str(x: int, width: int) -> str:
     return format(x, f"0{width}b")
 
+def _bits_array(bits_str: str) -> np.ndarray:
+    """0/1 string as an int vector, for display."""
+    return np.array([int(b) for b in bits_str], dtype=int)
+
 def _format_matrix(matrix: np.ndarray, name: str) -> str:
     return f"{name} ({matrix.shape[0]}x{matrix.shape[1]}):\n{matrix}"
 
@@ -44,32 +48,81 @@ def _infer_p_from_n(n: int) -> int:
         p += 1
     return p
 
-def _positions(n: int, p: int) -> Tuple[List[int], List[int]]:
-    parity_positions = [1 << j for j in range(p) if (1 << j) <= n]
-    data_positions = [i for i in range(1, n + 1) if i not in parity_positions]
+@lru_cache(maxsize=32)
+def _positions(n: int, p: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    parity_positions = tuple(1 << j for j in range(p) if (1 << j) <= n)
+    parity_set = set(parity_positions)
+    data_positions = tuple(i for i in range(1, n + 1) if i not in parity_set)
     return parity_positions, data_positions
 
+@lru_cache(maxsize=32)
 def _build_H_msb_top(n: int, p: int) -> np.ndarray:
     """
     Build H with p rows and n columns; each column j (1-based) is the p-bit
     binary representation of j with **MSB at the top row**.
+    Cached per (n, p), so the returned matrix is read-only.
     """
-    H = np.zeros((p, n), dtype=int)
-    for col in range(1, n + 1):
-        bits = _binary_str(col, p)  # MSB..LSB
-        for r, ch in enumerate(bits):  # r=0 is the top row (MSB)
-            H[r, col - 1] = 1 if ch == '1' else 0
+    cols = np.arange(1, n + 1, dtype=np.uint32)
+    shifts = np.arange(p - 1, -1, -1, dtype=np.uint32)  # r=0 is the top row (MSB)
+    H = ((cols[None, :] >> shifts[:, None]) & 1).astype(np.int8)
+    H.flags.writeable = False
     return H
 
+def _pack_rows(H: np.ndarray) -> List[int]:
+    """
+    Each row of H as an int whose bits follow the codeword string
+    (column 1 is the most significant bit), for AND + popcount parity checks.
+    """
+    ascii_rows = (H + ord("0")).astype(np.uint8)  # 0/1 → b"0"/b"1"
+    return [int(row.tobytes().decode("ascii"), 2) for row in ascii_rows]
+
+@lru_cache(maxsize=32)
+def _packed_rows(n: int, p: int) -> Tuple[int, ...]:
+    """Packed rows of the (n, p) parity-check matrix, built once per length."""
+    return tuple(_pack_rows(_build_H_msb_top(n, p)))
+
 def _xor_list_mod2(bits: List[int]) -> int:
-    acc = 0
-    for b in bits:
-        acc ^= (b & 1)
-    return acc
+    # XOR of bits == parity of their sum
+    return sum(bits) & 1
 
 
 # ---------- Decoding Logic (row-equation method) ----------
 
+def _validate_codeword(codeword_bits_str: str) -> Optional[str]:
+    """Error message for input that cannot be decoded, else None."""
+    if not isinstance(codeword_bits_str, str) or len(codeword_bits_str) == 0:
+        return "Error: Input cannot be empty."
+    if not all(c in "01" for c in codeword_bits_str):
+        return "Error: Input must be a binary string (0/1)."
+    n = len(codeword_bits_str)
+    p = _infer_p_from_n(n)
+    if p == 0 or n <= p:
+        return f"Error: Codeword length {n} is too small for Hamming decoding."
+    return None
+
+def _decode_core(codeword_int: int, n: int, p: int) -> Tuple[int, int, int]:
+    """
+    Integer-only decode for batch use: returns (syndrome_int, error_pos, data_int).
+    error_pos is 0 for a zero syndrome and -1 when the syndrome matches no column;
+    data_int packs the data bits (first data position as MSB) after any correction.
+    """
+    syndrome_int = 0
+    for row in _packed_rows(n, p):
+        syndrome_int = (syndrome_int << 1) | ((row & codeword_int).bit_count() & 1)
+
+    if syndrome_int == 0:
+        error_pos = 0
+    elif syndrome_int <= n:
+        error_pos = syndrome_int
+        codeword_int ^= 1 << (n - error_pos)
+    else:
+        error_pos = -1
+
+    data_int = 0
+    for pos in _positions(n, p)[1]:
+        data_int = (data_int << 1) | ((codeword_int >> (n - pos)) & 1)
+    return syndrome_int, error_pos, data_int
+
 def hamming_decode_logic(codeword_bits_str: str) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
     """
     Decode a (possibly corrupted) **systematic** Hamming codeword using the same
@@ -89,30 +142,45 @@ def hamming_decode_logic(codeword_bits_str: str) -> Tuple[Optional[Dict[str, obj
       - data_bits_positions, data_bits, data_bits_str
       - positions_table, columns_desc_str, highlighted_codeword_html, highlighted_corrected_codeword_html
     """
-    # Validate
-    if not isinstance(codeword_bits_str, str) or len(codeword_bits_str) == 0:
-        return None, "Error: Input cannot be empty."
-    if not all(c in "01" for c in codeword_bits_str):
-        return None, "Error: Input must be a binary string (0/1)."
+    # Validate before the cache lookup (non-strings can't be cache keys)
+    error = _validate_codeword(codeword_bits_str)
+    if error:
+        return None, error
 
+    results, error = _hamming_decode_cached(codeword_bits_str)
+    # Shallow copy: callers may add keys without touching the cached result
+    return (dict(results) if results is not None else None), error
+
+@lru_cache(maxsize=256)
+def _hamming_decode_cached(codeword_bits_str: str) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
+    """
+    Pure decode of one validated codeword; results are shared between calls,
+    so the numpy arrays in them are made read-only.
+    """
     # Parameters inferred from the codeword length
     n = len(codeword_bits_str)
     p = _infer_p_from_n(n)
-    if p == 0 or n <= p:
-        return None, f"Error: Codeword length {n} is too small for Hamming decoding."
-
     k = n - p
-    parity_positions, data_positions = _positions(n, p)
+    # Positions are cached as tuples; results keep lists (the page prints them)
+    parity_tuple, data_tuple = _positions(n, p)
+    parity_positions, data_positions = list(parity_tuple), list(data_tuple)
+
+    # Read the codeword as one int (position 1 is the MSB) plus a list of its bits;
+    # numpy arrays are only built for display at the end
+    bits = [int(b) for b in codeword_bits_str]
+    c_packed = int(codeword_bits_str, 2)
 
-    # Build H (MSB at top), and read codeword
-    H = _build_H_msb_top(n, p)
-    c = np.array([int(b) for b in codeword_bits_str], dtype=int)
+    # Syndrome bit r is the parity of (row r AND c); row 0 is the MSB
+    syndrome_int = 0
+    for row in _packed_rows(n, p):
+        syndrome_int = (syndrome_int << 1) | ((row & c_packed).bit_count() & 1)
 
     # ---- Row-by-row computation of s = H · cᵀ (mod 2) ----
     row_equations: List[Dict[str, object]] = []
     for r in range(p):
-        selected_positions = [j for j in range(1, n + 1) if H[r, j - 1] == 1]
-        selected_values = [int(c[j - 1]) for j in selected_positions]
+        # Row r (MSB row is 0) of H selects the positions whose bit p-1-r is set
+        selected_positions = [j for j in range(1, n + 1) if (j >> (p - 1 - r)) & 1]
+        selected_values = [bits[j - 1] for j in selected_positions]
         s_r = _xor_list_mod2(selected_values)
 
         pos_list_str = ", ".join(str(j) for j in selected_positions)
@@ -120,7 +188,7 @@ def hamming_decode_logic(codeword_bits_str: str) -> Tuple[Optional[Dict[str, obj
 
         # Human-friendly equation text: e.g., "s₀ = c₁ ⊕ c₃ ⊕ c₅ = 1 ⊕ 0 ⊕ 1 = 0"
         names = [f"c{_to_subscript(j)}" for j in selected_positions]
-        vals  = [str(c[j - 1]) for j in selected_positions]
+        vals  = [codeword_bits_str[j - 1] for j in selected_positions]
         if names:
             lhs = f"s{_to_subscript(r)}"
             eqn_text = f"{lhs} = " + " ⊕ ".join(names) + "   ⇒   " + f"{lhs} = " + " ⊕ ".join(vals) + f" = {s_r}"
@@ -135,21 +203,20 @@ def hamming_decode_logic(codeword_bits_str: str) -> Tuple[Optional[Dict[str, obj
             "row_sum": s_r,
         })
 
-    # Syndrome via matrix product (sanity-check matches row-by-row sums)
-    syndrome = (H @ c) % 2
-    if any(eq["row_sum"] != int(syndrome[eq["row_index"]]) for eq in row_equations):
+    # Syndrome vector for display
+    syndrome_ok = syndrome_int == 0
+    syndrome_bits = _binary_str(syndrome_int, p)  # MSB..LSB
+    # Cross-check against the row-by-row sums (skipped under python -O)
+    if __debug__ and any(eq["row_sum"] != int(syndrome_bits[eq["row_index"]]) for eq in row_equations):
         return None, "Internal error: row-by-row sums disagree with H · cᵀ."
 
-    syndrome_ok = bool((syndrome.sum() == 0))
-    syndrome_bits = "".join(str(int(b)) for b in syndrome.tolist())  # MSB..LSB
-    syndrome_int = int(syndrome_bits, 2) if not syndrome_ok else 0
-
-    # Match syndrome to one of our **existing** columns (MSB-at-top)
-    match_positions = [j for j in range(1, n + 1) if np.array_equal(H[:, j - 1], syndrome)]
+    # Match syndrome to one of our **existing** columns (MSB-at-top): column j is
+    # the binary of j, so a non-zero syndrome read as an int is the column index
+    match_positions = [syndrome_int] if 1 <= syndrome_int <= n else []
     decision: Dict[str, object]
     error_position: Optional[int] = None
-    c_corrected = c.copy()
-    syndrome_after = None
+    c_corrected = c_packed
+    syndrome_after_int: Optional[int] = None
 
     if syndrome_ok:
         decision = {
@@ -160,9 +227,10 @@ def hamming_decode_logic(codeword_bits_str: str) -> Tuple[Optional[Dict[str, obj
         if len(match_positions) == 1:
             # Standard single-bit correction
             error_position = match_positions[0]
-            c_corrected[error_position - 1] ^= 1
-            syndrome_after = (H @ c_corrected) % 2
-            if syndrome_after.sum() == 0:
+            c_corrected ^= 1 << (n - error_position)
+            # Flipping bit j adds column j (the binary of j) to the syndrome
+            syndrome_after_int = syndrome_int ^ error_position
+            if syndrome_after_int == 0:
                 decision = {
                     "status": "corrected",
                     "explanation": (
@@ -190,54 +258,56 @@ def hamming_decode_logic(codeword_bits_str: str) -> Tuple[Optional[Dict[str, obj
             }
 
     # Extract data bits from the **final** codeword (corrected if we corrected)
-    final_c = c_corrected if decision["status"] in {"corrected", "ok"} else c
-    data_bits = [int(final_c[pos - 1]) for pos in data_positions]
-    data_bits_str = "".join(str(b) for b in data_bits)
+    final_c = c_corrected if decision["status"] in {"corrected", "ok"} else c_packed
+    final_c_str = _binary_str(final_c, n)
+    data_bits_str = "".join(final_c_str[pos - 1] for pos in data_positions)
+    data_bits = [int(b) for b in data_bits_str]
 
     # ---- Explanations and helpers (mirroring encoder UI) ----
-    columns_desc = [f"{col}:{_binary_str(col, p)}" for col in range(1, n + 1)]
-    columns_desc_str = " | ".join(columns_desc)
-
+    # Column patterns are formatted once and shared by both listings
     parity_set = set(parity_positions)
+    columns_desc = []
     pos_lines = []
     for pos in range(1, n + 1):
+        pattern = bin(pos)[2:].zfill(p)
         tag = "P" if pos in parity_set else "D"
-        pos_lines.append(f"{pos:>3}  [{_binary_str(pos, p)}]  {tag}")
+        columns_desc.append(f"{pos}:{pattern}")
+        pos_lines.append(f"{pos:>3}  [{pattern}]  {tag}")
+    columns_desc_str = " | ".join(columns_desc)
     positions_table = "pos  [MSB..LSB]  type\n" + "\n".join(pos_lines)
 
     # Highlight parity positions in original and corrected codewords
-    def _highlight_codeword(bits: np.ndarray) -> str:
-        parts = []
-        for idx, bit in enumerate(bits.tolist(), start=1):
-            if idx in parity_set:
-                parts.append(f"<span style='color:#FF4B4B;font-weight:700;'>{bit}</span>")
-            else:
-                parts.append(str(bit))
+    parity_flags = [pos in parity_set for pos in range(1, n + 1)]
+    parity_span = "<span style='color:#FF4B4B;font-weight:700;'>{}</span>".format
+
+    def _highlight_codeword(bits_str: str) -> str:
+        parts = [parity_span(bit) if is_parity else bit
+                 for bit, is_parity in zip(bits_str, parity_flags)]
         return (
             "<div style='font-family:monospace;font-size:1.25rem;'>"
             + " ".join(parts)
             + "</div>"
         )
 
-    highlighted_codeword_html = _highlight_codeword(c)
-    highlighted_corrected_codeword_html = _highlight_codeword(final_c)
+    highlighted_codeword_html = _highlight_codeword(codeword_bits_str)
+    highlighted_corrected_codeword_html = _highlight_codeword(final_c_str)
 
     results: Dict[str, object] = {
         "n": n, "p": p, "k": k,
         "parity_positions": parity_positions,
         "data_positions": data_positions,
-        "H": H,
-        "c": c,
+        "H": _build_H_msb_top(n, p),
+        "c": _bits_array(codeword_bits_str),
         "row_equations": row_equations,
-        "syndrome": syndrome,
+        "syndrome": _bits_array(syndrome_bits),
         "syndrome_ok": syndrome_ok,
         "syndrome_bits": syndrome_bits,
         "syndrome_int": syndrome_int,
         "match_positions": match_positions,
         "decision": decision,
         "error_position": error_position,
-        "c_corrected": final_c,
-        "syndrome_after": syndrome_after,
+        "c_corrected": _bits_array(final_c_str),
+        "syndrome_after": _bits_array(_binary_str(syndrome_after_int, p)) if syndrome_after_int is not None else None,
         "data_bits_positions": data_positions,
         "data_bits": data_bits,
         "data_bits_str": data_bits_str,
@@ -246,6 +316,9 @@ def hamming_decode_logic(codeword_bits_str: str) -> Tuple[Optional[Dict[str, obj
         "highlighted_codeword_html": highlighted_codeword_html,
         "highlighted_corrected_codeword_html": highlighted_corrected_codeword_html,
     }
+    for value in results.values():
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
     return results, None
 
 
@@ -302,10 +375,8 @@ matrix \(H\) as in the encoder.
 
         # 3) Show cᵀ and compute H · cᵀ row-by-row
         st.markdown("### 3) Transposed codeword **cᵀ** and row equations")
-        SUBSCRIPT_MAP = {'0':'₀','1':'₁','2':'₂','3':'₃','4':'₄','5':'₅','6':'₆','7':'₇','8':'₈','9':'₉'}
-        SUB_TRANS = str.maketrans(SUBSCRIPT_MAP)
-        max_label = max(len(str(i)) for i in range(1, results['n'] + 1))
-        cT_rows = [f"[c{str(i).translate(SUB_TRANS)} = {int(results['c'][i-1])}]" for i in range(1, results['n']+1)]
+        c_vals = results['c'].tolist()  # plain ints, converted once
+        cT_rows = [f"[c{str(i).translate(_SUB_TRANS)} = {bit}]" for i, bit in enumerate(c_vals, start=1)]
         st.code("cᵀ ({n}x1):\n{rows}".format(n=results['n'], rows="\n".join(cT_rows)))
 
         st.markdown("**Row-by-row XORs (each row produces one syndrome bit):**")
@@ -348,7 +419,7 @@ matrix \(H\) as in the encoder.
         st.markdown("### 6) Extract and assemble the data bits")
         positions = ", ".join(str(p) for p in results["data_positions"])
         st.markdown(f"- **Data positions (non-powers of two):** {positions}")
-        st.markdown(f"- **Data bits (in-order):** `{''.join(str(b) for b in results['data_bits'])}`")
+        st.markdown(f"- **Data bits (in-order):** `{results['data_bits_str']}`")
         st.success(f"**Decoded payload:** `{results['data_bits_str']}`")
 
         # 7) Note on 2-bit errors
@@ -359,21 +430,22 @@ matrix \(H\) as in the encoder.
         )
 
 
-# (optional) helpers for unit tests
+# (optional) helpers for unit tests; integer-only, without building the explanation
 def _decode_return_data_bits(codeword_bits_str: str) -> str:
     """Return only the decoded data bitstring (after correction if applicable)."""
-    results, err = hamming_decode_logic(codeword_bits_str)
+    err = _validate_codeword(codeword_bits_str)
     if err:
         raise ValueError(err)
-    return results["data_bits_str"]
+    n = len(codeword_bits_str)
+    p = _infer_p_from_n(n)
+    _, _, data_int = _decode_core(int(codeword_bits_str, 2), n, p)
+    return format(data_int, f"0{n - p}b")
 
 def _decode_return_error_position(codeword_bits_str: str) -> int:
     """Return 0 if no error, or 1-based error position if a single-bit correction was made (else -1)."""
-    results, err = hamming_decode_logic(codeword_bits_str)
+    err = _validate_codeword(codeword_bits_str)
     if err:
         raise ValueError(err)
-    if results["syndrome_ok"]:
-        return 0
-    if results["decision"]["status"] == "corrected" and results["error_position"] is not None:
-        return int(results["error_position"])
-    return -1
\ No newline at end of file
+    n = len(codeword_bits_str)
+    _, error_pos, _ = _decode_core(int(codeword_bits_str, 2), n, _infer_p_from_n(n))
+    return error_pos
@@ -21,26 +21,28 @@
 
 import streamlit as st
 import numpy as np
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 
 # ---------- Utilities ----------
 
+# Digit → subscript translation table, built once per process
+_SUB_TRANS = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+
 def _to_subscript(s: object) -> str:
     """Converts a number or string of digits to unicode subscript characters."""
-    SUBSCRIPT_MAP = {
-        '0': '₀', '1': '₁', '2': '₂', '3': '₃', '4': '₄',
-        '5': '₅', '6': '₆', '7': '₇', '8': '₈', '9': '₉'
-    }
-    return "".join(SUBSCRIPT_MAP.get(char, char) for char in str(s))
+    return str(s).translate(_SUB_TRANS)
 
 def _find_p(k: int) -> int:
     """
     Return the minimal number of parity bits p such that 2^p >= k + p + 1.
     Supports both full and (if needed) shortened Hamming lengths.
     """
-    p = 0
-    while (1 << p) < (k + p + 1):
+    # p = bit_length(k) already covers k + p + 1 unless k sits just below a
+    # power of two, in which case one more parity bit is needed.
+    p = k.bit_length()
+    if (1 << p) < (k + p + 1):
         p += 1
     return p
 
@@ -51,15 +53,10 @@ def _positions(n: int, p: int) -> Tuple[List[int], List[int]]:
     Parity positions are powers of two within 1..n.
     """
     parity_positions = [1 << j for j in range(p) if (1 << j) <= n]
-    data_positions = [i for i in range(1, n + 1) if i not in parity_positions]
+    data_positions = [i for i in range(1, n + 1) if i & (i - 1)]  # i & (i-1) == 0 only for powers of two
     return parity_positions, data_positions
 
 
-def _binary_str(x: int, width: int) -> str:
-    """Binary string MSB..LSB with fixed width."""
-    return format(x, f"0{width}b")
-
-
 def _format_matrix(matrix: np.ndarray, name: str) -> str:
     return f"{name} ({matrix.shape[0]}x{matrix.shape[1]}):\n{matrix}"
 
@@ -74,26 +71,76 @@ def _build_H_msb_top(n: int, p: int) -> np.ndarray:
     Example for n=7, p=3 (rows top→bottom are MSB→LSB):
     columns 1..7 are 001, 010, 011, 100, 101, 110, 111.
     """
-    H = np.zeros((p, n), dtype=int)
-    for col in range(1, n + 1):
-        bits = _binary_str(col, p)  # MSB..LSB
-        for r, ch in enumerate(bits):  # r=0 top row (MSB)
-            H[r, col - 1] = 1 if ch == '1' else 0
-    return H
+    cols = np.arange(1, n + 1, dtype=np.uint32)[None, :]
+    shifts = np.arange(p - 1, -1, -1, dtype=np.uint32)[:, None]  # r=0 top row (MSB)
+    return ((cols >> shifts) & 1).astype(np.uint8)
+
+
+@lru_cache(maxsize=32)
+def _structure(k: int) -> Tuple[int, int, np.ndarray, Tuple[int, ...], Tuple[int, ...], np.ndarray, str, str]:
+    """
+    Everything that depends only on the data length k, built once per k:
+    (p, n, H, parity_positions, data_positions, parity_mask, columns_desc_str,
+    positions_table). The arrays are shared between calls, so they are read-only.
+    """
+    p = _find_p(k)
+    n = k + p
+
+    parity_positions, data_positions = _positions(n, p)
+    parity_mask = np.zeros(n, dtype=bool)  # parity_mask[pos - 1] is True at parity positions
+    parity_mask[np.array(parity_positions) - 1] = True
 
+    # Build H as described (MSB at top)
+    H = _build_H_msb_top(n, p)
+    H.flags.writeable = False
+    parity_mask.flags.writeable = False
 
-def _xor_list_mod2(bits: List[int]) -> int:
-    """XOR-reduce a list of 0/1 ints; empty list → 0."""
-    if not bits:
-        return 0
-    acc = 0
-    for b in bits:
-        acc ^= (b & 1)
-    return acc
+    # Column patterns (MSB..LSB) read straight off H: each column of Hᵀ as ASCII 0/1
+    patterns_blob = (H.T + ord("0")).astype(np.uint8).tobytes().decode("ascii")
+    patterns = [patterns_blob[i:i + p] for i in range(0, n * p, p)]
+
+    # Show columns of H as col#:bits (MSB..LSB)
+    columns_desc_str = " | ".join(f"{col}:{pattern}" for col, pattern in enumerate(patterns, start=1))
+
+    # Positions helper table (P for parity, D for data)
+    tags = ["P" if is_parity else "D" for is_parity in parity_mask.tolist()]
+    pos_lines = [f"{pos:>3}  [{pattern}]  {tag}"
+                 for pos, (pattern, tag) in enumerate(zip(patterns, tags), start=1)]
+    positions_table = "pos  [MSB..LSB]  type\n" + "\n".join(pos_lines)
+
+    return (p, n, H, tuple(parity_positions), tuple(data_positions), parity_mask,
+            columns_desc_str, positions_table)
 
 
 # ---------- Encoding Logic (row-equation method) ----------
 
+def _validate_data(data_bits_str: str) -> Optional[str]:
+    """Error message for input that cannot be encoded, else None."""
+    if not isinstance(data_bits_str, str) or len(data_bits_str) == 0:
+        return "Error: Input cannot be empty."
+    if data_bits_str.strip("01"):  # anything left after stripping 0/1 is invalid
+        return "Error: Input must be a binary string (0/1)."
+    return None
+
+def _encode_core(data_int: int, k: int) -> int:
+    """
+    Integer-only encode for batch use: data_int packs the k data bits (d₁ as MSB);
+    returns the n-bit codeword packed the same way (position 1 as MSB).
+    """
+    _, n, _, _, data_positions, _, _, _ = _structure(k)
+    codeword_int = 0
+    xor_of_ones = 0  # XOR of the positions holding a 1 == syndrome before parity
+    for i, pos in enumerate(data_positions):
+        if (data_int >> (k - 1 - i)) & 1:
+            codeword_int |= 1 << (n - pos)
+            xor_of_ones ^= pos
+    # Parity position 2^j takes bit j of that XOR, which brings the syndrome to zero
+    while xor_of_ones:
+        low = xor_of_ones & -xor_of_ones
+        codeword_int |= 1 << (n - low)
+        xor_of_ones ^= low
+    return codeword_int
+
 def hamming_encode_logic(data_bits_str: str) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
     """
     Pure logic function. Performs systematic Hamming encoding by building the
@@ -103,65 +150,58 @@ def hamming_encode_logic(data_bits_str: str) -> Tuple[Optional[Dict[str, object]
     The displayed explanation is **rule-based** and **row-by-row**:
     each row yields one simple equation with one unknown parity bit.
     """
-    # Validate input
-    if not isinstance(data_bits_str, str) or len(data_bits_str) == 0:
-        return None, "Error: Input cannot be empty."
-    if not all(c in "01" for c in data_bits_str):
-        return None, "Error: Input must be a binary string (0/1)."
+    err = _validate_data(data_bits_str)
+    if err:
+        return None, err
+    return _hamming_encode_cached(data_bits_str)
 
-    # Parameters
+@st.cache_data(max_entries=128, show_spinner=False)
+def _hamming_encode_cached(data_bits_str: str) -> Tuple[Optional[Dict[str, object]], Optional[str]]:
+    """
+    Encode one validated data string. Cached across Streamlit reruns; each call
+    gets its own copy of the results, so callers may modify them freely.
+    """
+    # Parameters, H and the tables that depend only on k
     k = len(data_bits_str)
-    p = _find_p(k)
-    n = k + p
-
-    parity_positions, data_positions = _positions(n, p)
-    d_bits = np.array([int(b) for b in data_bits_str], dtype=int)  # shape (k,)
-
-    # Build H as described (MSB at top)
-    H = _build_H_msb_top(n, p)
+    (p, n, H, parity_positions, data_positions, parity_mask,
+     columns_desc_str, positions_table) = _structure(k)
+    d_bits = np.frombuffer(data_bits_str.encode("ascii"), dtype=np.uint8) - ord("0")  # shape (k,)
 
     # Place data bits into codeword positions (parity bits unknown for now)
-    c = np.zeros(n, dtype=int)
+    c = np.zeros(n, dtype=np.uint8)
     for i, pos in enumerate(data_positions):
         c[pos - 1] = d_bits[i]
 
-    # Helper: map codeword position -> data index (for readable equations)
-    pos_to_didx = {pos: i for i, pos in enumerate(data_positions)}  # 0-based data index
+    # Term names and values per data index (for readable equations), gathered per row
+    d_names = np.array([f"d{_to_subscript(i)}" for i in range(1, k + 1)], dtype=object)
+    d_chars = np.array(list(data_bits_str), dtype=object)
 
     # ---- Rule-based equations from H · cᵀ = 0 (mod 2) ----
     # Row r selects all columns where H[r, j] == 1. Exactly one of those columns
     # is a parity position; call it ppos. Then:
     #    c[ppos] ⊕ (XOR of selected data bits) = 0  ⇒  c[ppos] = XOR(selected data bits)
-    row_equations: List[Dict[str, object]] = []
-    parity_by_position: Dict[int, int] = {}  # pos -> bit
+    # All rows are solved at once from H restricted to the data columns; with MSB-at-top
+    # columns, row r's parity position is 2^(p-1-r).
+    H_data = H[:, ~parity_mask]
+    parity_bits = ((H_data @ d_bits) & 1).tolist()  # uint8 sums may wrap; wrapping keeps the low bit
+    parity_by_position: Dict[int, int] = {1 << (p - 1 - r): parity_bits[r] for r in range(p)}  # pos -> bit
 
+    # Row-by-row explanation, fed from the solved parity bits
+    row_equations: List[Dict[str, object]] = []
     for r in range(p):
-        selected_positions = [j for j in range(1, n + 1) if H[r, j - 1] == 1]
-        parity_in_row = [j for j in selected_positions if j in parity_positions]
-        if len(parity_in_row) != 1:
-            # For this construction, there must be exactly one parity column per row
-            return None, "Internal error: row does not have exactly one parity position."
-
-        ppos = parity_in_row[0]  # the unique parity position for this row
-        data_positions_used = [j for j in selected_positions if j not in parity_positions]
-        data_bits_used = [int(c[j - 1]) for j in data_positions_used]
-        parity_value = _xor_list_mod2(data_bits_used)
-
-        parity_by_position[ppos] = parity_value
+        selected = np.flatnonzero(H[r]) + 1  # 1-based positions with a 1 in this row
+        ppos = 1 << (p - 1 - r)  # the unique parity position for this row
+        selected_positions = selected.tolist()
+        data_positions_used = selected[~parity_mask[selected - 1]].tolist()
+        didx_used = np.flatnonzero(H_data[r])  # 0-based data indices on this row
+        parity_value = parity_bits[r]
 
         # Build human-friendly equation text with subscripts
         # Example: p₄ = d₂ ⊕ d₃ ⊕ d₄   ⇒   p₄ = 1 ⊕ 0 ⊕ 1 = 0
         lhs = f"p{_to_subscript(ppos)}"
-        rhs_terms_names = []
-        rhs_terms_vals = []
-        for j in data_positions_used:
-            didx = pos_to_didx[j]  # 0-based in input string
-            rhs_terms_names.append(f"d{_to_subscript(didx + 1)}")
-            rhs_terms_vals.append(str(c[j - 1]))
-
-        if rhs_terms_names:
-            rhs_names = " ⊕ ".join(rhs_terms_names)
-            rhs_vals = " ⊕ ".join(rhs_terms_vals)
+        if didx_used.size:
+            rhs_names = " ⊕ ".join(d_names[didx_used])
+            rhs_vals = " ⊕ ".join(d_chars[didx_used])
             eqn_text = f"{lhs} = {rhs_names}   ⇒   {lhs} = {rhs_vals} = {parity_value}"
         else:
             # No data terms on this row ⇒ parity is 0
@@ -169,7 +209,7 @@ def hamming_encode_logic(data_bits_str: str) -> Tuple[Optional[Dict[str, object]
 
         # Also provide a compact “row sums these positions” view with subscript
         pos_list_str = ", ".join(str(j) for j in selected_positions)
-        compact = f"Row {r} (MSB row is 0): XOR positions {{{pos_list_str}}} = 0 ⇒ unknown is p{_to_subscript(ppos)}."
+        compact = f"Row {r} (MSB row is 0): XOR positions {{{pos_list_str}}} = 0 ⇒ unknown is {lhs}."
 
         row_equations.append({
             "row_index": r,
@@ -185,39 +225,14 @@ def hamming_encode_logic(data_bits_str: str) -> Tuple[Optional[Dict[str, object]
     for pos, bit in parity_by_position.items():
         c[pos - 1] = bit
 
-    # Verify H · cᵀ = 0
-    syndrome = (H @ c) % 2
-    syndrome_ok = bool((syndrome.sum() == 0))
+    # Verify H · cᵀ = 0. Column j of H is the binary of j, so the syndrome read as an
+    # int is the XOR of the positions holding a 1; unpack it MSB-first for display.
+    syndrome_int = int(np.bitwise_xor.reduce(np.flatnonzero(c) + 1))
+    syndrome = (syndrome_int >> np.arange(p - 1, -1, -1)) & 1
+    syndrome_ok = syndrome_int == 0
 
     # ---- Explanations and helpful tables ----
 
-    # Show columns of H as col#:bits (MSB..LSB)
-    columns_desc = []
-    for col in range(1, n + 1):
-        columns_desc.append(f"{col}:{_binary_str(col, p)}")
-    columns_desc_str = " | ".join(columns_desc)
-
-    # Positions helper table (P for parity, D for data)
-    parity_set = set(parity_positions)
-    pos_lines = []
-    for pos in range(1, n + 1):
-        tag = "P" if pos in parity_set else "D"
-        pos_lines.append(f"{pos:>3}  [{_binary_str(pos, p)}]  {tag}")
-    positions_table = "pos  [MSB..LSB]  type\n" + "\n".join(pos_lines)
-
-    # Highlight parity bits in the final codeword
-    highlighted_parts = []
-    for idx, bit in enumerate(c.tolist(), start=1):
-        if idx in parity_set:
-            highlighted_parts.append(f"<span style='color:#FF4B4B;font-weight:700;'>{bit}</span>")
-        else:
-            highlighted_parts.append(str(bit))
-    highlighted_codeword_html = (
-        "<div style='font-family:monospace;font-size:1.25rem;'>"
-        + " ".join(highlighted_parts)
-        + "</div>"
-    )
-
     # Map parity positions to the row that solved them (top row is r=0)
     parity_row_map = {eq["parity_position"]: eq["row_index"] for eq in row_equations}
 
@@ -226,8 +241,9 @@ def hamming_encode_logic(data_bits_str: str) -> Tuple[Optional[Dict[str, object]
         "k": k,
         "p": p,
         "n": n,
-        "parity_positions": parity_positions,
-        "data_positions": data_positions,
+        "parity_positions": list(parity_positions),
+        "parity_mask": parity_mask,                         # bool per position, True at parity
+        "data_positions": list(data_positions),
         "H": H,
         "d_bits": d_bits,
         "row_equations": row_equations,
@@ -235,10 +251,10 @@ def hamming_encode_logic(data_bits_str: str) -> Tuple[Optional[Dict[str, object]
         "parity_positions_ordered_bits": [parity_by_position[pos] for pos in parity_positions],
         "parity_row_map": parity_row_map,                   # {position: row_index}
         "codeword": c,
+        "codeword_str": (c + ord("0")).astype(np.uint8).tobytes().decode("ascii"),
         "syndrome": syndrome,
         "syndrome_ok": syndrome_ok,
         "columns_desc_str": columns_desc_str,
-        "highlighted_codeword_html": highlighted_codeword_html,
         "positions_table": positions_table,
     }
     return results, None
@@ -289,22 +305,22 @@ def render() -> None:
         )
 
         st.markdown("**Initial codeword structure (data bits placed, parity bits unknown):**")
-        
-        # Create a mapping from data position to the actual data bit
-        data_map = {pos: bit for pos, bit in zip(results['data_positions'], results['d_bits'])}
-        
-        # Build the list of parts for the initial codeword display
+
+        # One pass over the positions builds both the initial codeword display and
+        # the cᵀ rows. Data positions are ascending, so data bits are consumed in order.
         initial_codeword_parts = []
-        parity_set = set(results['parity_positions'])
-        for i in range(1, results['n'] + 1):
-            if i in parity_set:
+        c_transpose_rows = []
+        data_bits = iter(results['d_bits'].tolist())
+        for i, is_parity in enumerate(results['parity_mask'].tolist(), start=1):
+            if is_parity:
                 # Placeholder for unknown parity bits, styled like the final ones
-                part = f"<span style='color:#FF4B4B;font-weight:700;'>p<sub>{i}</sub></span>"
-                initial_codeword_parts.append(part)
+                initial_codeword_parts.append(f"<span style='color:#FF4B4B;font-weight:700;'>p<sub>{i}</sub></span>")
+                c_transpose_rows.append(f"p{str(i).translate(_SUB_TRANS)}")
             else:
                 # Data bit
-                part = str(data_map[i])
-                initial_codeword_parts.append(part)
+                bit = str(next(data_bits))
+                initial_codeword_parts.append(bit)
+                c_transpose_rows.append(bit)
         
         # Assemble into the final HTML string with the same styling as the final codeword
         initial_codeword_html = (
@@ -325,27 +341,7 @@ def render() -> None:
         st.markdown("Parity-check matrix **H**:")
         st.code(_format_matrix(results["H"], "H"))
 
-        # Helper for unicode subscripts, defined locally for simple insertion
-        SUBSCRIPT_MAP = {
-            '0': '₀', '1': '₁', '2': '₂', '3': '₃', '4': '₄',
-            '5': '₅', '6': '₆', '7': '₇', '8': '₈', '9': '₉'
-        }
-        SUB_TRANS = str.maketrans(SUBSCRIPT_MAP)
-
         st.markdown("Transposed codeword **cᵀ**:")
-        # Build the vector rows
-        c_transpose_rows = []
-        parity_set = set(results['parity_positions'])
-        data_map = {pos: bit for pos, bit in zip(results['data_positions'], results['d_bits'])}
-
-        for i in range(1, results['n'] + 1):
-            if i in parity_set:
-                label = f"p{str(i).translate(SUB_TRANS)}"
-                c_transpose_rows.append(label)
-            else:
-                label = str(data_map[i])
-                c_transpose_rows.append(label)
-        
         # Find max width for alignment and format the matrix string
         max_width = max(len(s) for s in c_transpose_rows)
         formatted_rows = [f"[{s:^{max_width}}]" for s in c_transpose_rows]
@@ -371,7 +367,15 @@ def render() -> None:
         # 4) Assemble and verify
         st.markdown("### 4) Final codeword and verification")
         st.markdown("Codeword (parity bits highlighted):")
-        st.markdown(results["highlighted_codeword_html"], unsafe_allow_html=True)
+        parity_span = "<span style='color:#FF4B4B;font-weight:700;'>{}</span>".format
+        highlighted_parts = [parity_span(bit) if is_parity else bit
+                             for bit, is_parity in zip(results["codeword_str"], results["parity_mask"].tolist())]
+        highlighted_codeword_html = (
+            "<div style='font-family:monospace;font-size:1.25rem;'>"
+            + " ".join(highlighted_parts)
+            + "</div>"
+        )
+        st.markdown(highlighted_codeword_html, unsafe_allow_html=True)
         st.markdown("Syndrome `H · cᵀ` (should be all zeros):")
         st.code(str(results["syndrome"]))
         if results["syndrome_ok"]:
@@ -383,7 +387,9 @@ def render() -> None:
 # (optional) expose a small helper for external unit tests
 def _encode_return_codeword(data_bits_str: str) -> str:
     """Return just the final codeword string for quick tests."""
-    results, err = hamming_encode_logic(data_bits_str)
+    err = _validate_data(data_bits_str)
     if err:
         raise ValueError(err)
-    return "".join(str(b) for b in results["codeword"].tolist())
\ No newline at end of file
+    k = len(data_bits_str)
+    n = _structure(k)[1]
+    return format(_encode_core(int(data_bits_str, 2), k), f"0{n}b")
\ No newline at end of file
@@ -14,8 +14,8 @@
 
 from __future__ import annotations
 import re
-import itertools as it
 from typing import List, Tuple, Dict, Set, Optional
+import numpy as np
 import streamlit as st
 
 # --------------------------- Helpers: Gray code & layout ---------------------------
@@ -47,12 +47,21 @@ def kmap_dims(nvars: int) -> Tuple[int,int,int,int]:
         return 4, 4, 2, 2
     return 4, 8, 2, 3  # n == 5
 
-def bitstr_to_int(bits: List[int]) -> int:
-    """MSB-first list of bits -> integer."""
-    val = 0
-    for b in bits:
-        val = (val << 1) | (1 if b else 0)
-    return val
+def minterms_to_mask(minterms) -> int:
+    """Set of minterm indices -> bitmask with bit m set for each minterm m."""
+    mask = 0
+    for m in minterms:
+        mask |= 1 << m
+    return mask
+
+def mask_to_minterms(mask: int) -> List[int]:
+    """Bitmask -> ascending list of the minterm indices it contains."""
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
 
 # --------------------------- Expression parsing & eval -----------------------------
 
@@ -123,25 +132,55 @@ def _norm_expr(s: str) -> Tuple[str, List[str]]:
     used = sorted({ch for ch in s if ch in VAR_SET}, key=lambda v: VAR_SET.index(v))
     return s, used
 
+_BITWISE_OPS = {"not": "~", "and": "&", "or": "|"}
+# The only tokens a bitwise rewrite can evaluate with boolean meaning: anything else
+# (^, comparisons, arithmetic, other digits) would silently change the result
+_BIT_EXPR_TOKEN = re.compile(r"\s+|([A-Za-z_]\w*)|\b([01])\b|[~&|()]")
+
 def _eval_expr_to_minterms(expr: str, var_order: List[str]) -> Set[int]:
     """
     Evaluate expression for all 2^n assignments in var_order (MSB→LSB)
     and return the set of minterm indices that evaluate True.
+
+    The whole truth table is evaluated at once: each variable becomes a 2^n-bit
+    integer whose bit m is that variable's value in minterm m, and the boolean
+    operators become their bitwise counterparts (same relative precedence).
+    Raises ValueError for symbols other than variables, NOT/AND/OR, parentheses
+    and the constants 0/1.
     """
     py_expr, used = _norm_expr(expr)
     # If user uses fewer vars than var_order, shrink
     if used:
         var_order = [v for v in var_order if v in used]
     n = len(var_order)
-    ones: Set[int] = set()
-    # Build all assignments (MSB first)
-    for bits in it.product([0,1], repeat=n):
-        env = {var_order[i]: bool(bits[i]) for i in range(n)}
-        val = eval(py_expr, {"__builtins__": {}}, env)  # safe enough; no names other than A..E exist
-        if bool(val):
-            idx = bitstr_to_int(list(bits))
-            ones.add(idx)
-    return ones
+    full = (1 << (1 << n)) - 1
+
+    # Column of var i (MSB first): minterms whose bit (n-1-i) is set
+    env = {
+        var: sum(1 << m for m in range(1 << n) if (m >> (n - 1 - i)) & 1)
+        for i, var in enumerate(var_order)
+    }
+
+    # Operators only ever come out of _norm_expr in lowercase
+    bit_expr = re.sub(r"\b(not|and|or)\b", lambda mo: _BITWISE_OPS[mo.group(1)], py_expr)
+    # Whitelist the tokens; constants act as truth values (all-true / all-false columns)
+    tokens = []
+    pos = 0
+    while pos < len(bit_expr):
+        mo = _BIT_EXPR_TOKEN.match(bit_expr, pos)
+        if mo is None:
+            raise ValueError(f"Unsupported symbol '{bit_expr[pos]}' in expression.")
+        name, const = mo.group(1), mo.group(2)
+        if name is not None and name not in env:
+            raise ValueError(f"Unknown name '{name}' in expression. Use A..E.")
+        tokens.append(str(full) if const == "1" else mo.group())
+        pos = mo.end()
+    try:
+        val = eval(compile("".join(tokens), "<kmap>", "eval"), {"__builtins__": {}}, env) & full
+    except (SyntaxError, TypeError) as e:
+        raise ValueError("Malformed expression.") from e
+
+    return set(mask_to_minterms(val))
 
 # --------------------------- K-map model & rectangles ------------------------------
 
@@ -151,21 +190,14 @@ def build_maps(nvars: int, var_order: List[str]):
     gray_rows = gray_seq(rb) if rb > 0 else [0]
     gray_cols = gray_seq(cb) if cb > 0 else [0]
 
-    # Precompute: cell (r,c) -> minterm index (0..2^n-1) under var_order (MSB..LSB)
-    cell_to_minterm: List[List[int]] = [[0]*C for _ in range(R)]
-    minterm_to_cell: Dict[int, Tuple[int,int]] = {}
-
-    for ri, rcode in enumerate(gray_rows):
-        for ci, ccode in enumerate(gray_cols):
-            bits = []
-            # Row vars first (MSB..), then col vars
-            for k in reversed(range(rb)):  # MSB first
-                bits.append((rcode >> k) & 1)
-            for k in reversed(range(cb)):
-                bits.append((ccode >> k) & 1)
-            idx = bitstr_to_int(bits)
-            cell_to_minterm[ri][ci] = idx
-            minterm_to_cell[idx] = (ri, ci)
+    # Precompute: cell (r,c) -> minterm index (0..2^n-1) under var_order (MSB..LSB).
+    # Row vars are the high bits, col vars the low bits: index = (row code << cb) | col code
+    cell_to_minterm = (
+        (np.array(gray_rows, dtype=np.int8)[:, None] << cb) | np.array(gray_cols, dtype=np.int8)[None, :]
+    )
+    minterm_to_cell: Dict[int, Tuple[int,int]] = {
+        m: (ri, ci) for ri, row in enumerate(cell_to_minterm.tolist()) for ci, m in enumerate(row)
+    }
 
     return {
         "R": R, "C": C, "rb": rb, "cb": cb,
@@ -175,94 +207,109 @@ def build_maps(nvars: int, var_order: List[str]):
         "var_order": var_order[:nvars]
     }
 
-def rect_cells(R, C, r0, c0, h, w):
-    """Cells covered by wrapping rectangle (r0..r0+h-1, c0..c0+w-1) modulo R,C."""
-    for dr in range(h):
-        for dc in range(w):
-            yield ((r0 + dr) % R, (c0 + dc) % C)
-
 def all_power2_sizes(R, C):
     hs = [1,2,4,8,16,32]
     ws = [1,2,4,8,16,32]
     return [ (h,w) for h in hs if h<=R for w in ws if w<=C ]
 
-def enumerate_prime_rects(model, ones: Set[int], dcs: Set[int]) -> List[Set[int]]:
+# Rectangle sizes per K-map shape, largest area first (one entry per supported nvars)
+_SIZES_BY_AREA_DESC: Dict[Tuple[int,int], List[Tuple[int,int]]] = {
+    (R, C): sorted(all_power2_sizes(R, C), key=lambda s: s[0]*s[1], reverse=True)
+    for R, C, _, _ in (kmap_dims(n) for n in range(1, 6))
+}
+
+# A group is its minterm bitmask (bit m set ⇔ minterm m covered) plus the wrapping
+# rectangle (r0, c0, h, w) it came from
+Rect = Tuple[int,int,int,int]
+Group = Tuple[int, Rect]
+
+def enumerate_prime_rects(model, ones: Set[int], dcs: Set[int]) -> List[Group]:
     """Enumerate maximal (prime) implicant rectangles using ones + don't-cares."""
     R, C = model["R"], model["C"]
     cell_to_min = model["cell_to_min"]
+    ones_mask = np.isin(cell_to_min, list(ones))
+    valid_mask = ones_mask | np.isin(cell_to_min, list(dcs))  # 1 or X
+    cell_bits = np.left_shift(1, cell_to_min, dtype=np.int64)  # minterm bit of each cell
     valid = []
     # collect all rectangles that contain only 1 or X (and at least one 1)
-    for h,w in sorted(all_power2_sizes(R,C), key=lambda s: s[0]*s[1], reverse=True):
+    for h,w in _SIZES_BY_AREA_DESC[(R, C)]:
+        # For every anchor (r0,c0) at once: AND/OR in each cell of the wrapping h×w
+        # rectangle by rolling that cell onto the anchor (np.roll wraps like the torus)
+        ok = np.ones((R, C), dtype=bool)
+        has_one = np.zeros((R, C), dtype=bool)
+        for dr in range(h):
+            for dc in range(w):
+                ok &= np.roll(valid_mask, (-dr, -dc), axis=(0, 1))
+                has_one |= np.roll(ones_mask, (-dr, -dc), axis=(0, 1))
         seen_sets = set()
-        for r0 in range(R):
-            for c0 in range(C):
-                mins = []
-                has_one = False
-                ok = True
-                for (r,c) in rect_cells(R,C,r0,c0,h,w):
-                    m = cell_to_min[r][c]
-                    mins.append(m)
-                    if m in ones:
-                        has_one = True
-                    elif m in dcs:
-                        pass
-                    else:
-                        ok = False
-                        break
-                if ok and has_one:
-                    s = frozenset(mins)
-                    if s not in seen_sets:
-                        seen_sets.add(s)
-                        valid.append(set(s))
-    # Keep only prime rectangles (not a proper subset of any other)
-    primes: List[Set[int]] = []
-    for s in valid:
-        if not any( (s < t) for t in valid ):  # strict subset test
-            primes.append(s)
+        for r0, c0 in np.argwhere(ok & has_one).tolist():  # row-major, like the scan it replaces
+            rows = [(r0 + dr) % R for dr in range(h)]
+            cols = [(c0 + dc) % C for dc in range(w)]
+            s = int(np.bitwise_or.reduce(cell_bits[np.ix_(rows, cols)], axis=None))
+            if s not in seen_sets:
+                seen_sets.add(s)
+                valid.append((s, (r0, c0, h, w)))
+    # Keep only prime rectangles (not a proper subset of any other). A strict superset
+    # of s has more cells, so it was collected earlier (larger area first), and it holds
+    # every minterm of s: only earlier rectangles containing min(s) need checking.
+    primes: List[Group] = []
+    rects_with: Dict[int, List[int]] = {}  # minterm bit -> earlier rectangles holding it
+    for s, rect in valid:
+        if not any( (s & t) == s and s != t for t in rects_with.get(s & -s, ()) ):  # strict subset test
+            primes.append((s, rect))
+        rest = s
+        while rest:
+            low = rest & -rest
+            rects_with.setdefault(low, []).append(s)
+            rest ^= low
     return primes
 
-def pick_cover(primes: List[Set[int]], ones: Set[int]) -> List[Set[int]]:
+def pick_cover(primes: List[Group], ones: Set[int]) -> List[Group]:
     """Essential primes + greedy set cover for remaining ones."""
-    cover: List[Set[int]] = []
-    uncovered = set(ones)
+    cover: List[Group] = []
+    uncovered = minterms_to_mask(ones)
     # Essential
-    for m in list(uncovered):
-        candidates = [p for p in primes if m in p]
+    for m in mask_to_minterms(uncovered):
+        candidates = [p for p in primes if (p[0] >> m) & 1]
         if len(candidates) == 1 and candidates[0] not in cover:
             cover.append(candidates[0])
-            uncovered -= candidates[0]
+            uncovered &= ~candidates[0][0]
     # Greedy
     while uncovered:
-        best = max(primes, key=lambda p: len(p & uncovered))
-        if len(best & uncovered) == 0:
+        best = max(primes, key=lambda p: (p[0] & uncovered).bit_count())
+        if not best[0] & uncovered:
             break
         cover.append(best)
-        uncovered -= best
+        uncovered &= ~best[0]
     return cover
 
-def implicant_to_term(minset: Set[int], nvars: int, var_order: List[str]) -> str:
+def implicant_to_term(model, rect: Rect) -> str:
     """
-    For a set of minterms, find literals that don't change across the set
+    For a group rectangle, find literals that don't change across its cells
     (0 → var', 1 → var). Output product term like A·B'·D.
+    A variable changes iff its Gray bit flips somewhere along the rectangle's
+    rows (row vars) or columns (col vars), so no minterm needs visiting.
     """
-    if not minset:
-        return "1"
-    # Build per-variable bit consistency
-    bits_by_var = [set() for _ in range(nvars)]
-    for m in minset:
-        for i in range(nvars):
-            bit = (m >> (nvars-1-i)) & 1  # MSB var_order[0]
-            bits_by_var[i].add(bit)
+    R, C, cb = model["R"], model["C"], model["cb"]
+    rows_gray, cols_gray = model["rows_gray"], model["cols_gray"]
+    var_order = model["var_order"]
+    nvars = len(var_order)
+    r0, c0, h, w = rect
+    row_vary = 0
+    for dr in range(h):
+        row_vary |= rows_gray[r0] ^ rows_gray[(r0 + dr) % R]
+    col_vary = 0
+    for dc in range(w):
+        col_vary |= cols_gray[c0] ^ cols_gray[(c0 + dc) % C]
+    vary = (row_vary << cb) | col_vary  # row vars are the high (MSB) bits of a minterm
+    rep = int(model["cell_to_min"][r0, c0])  # any cell of the rectangle
     lits = []
-    for i,var in enumerate(var_order[:nvars]):
-        vals = bits_by_var[i]
-        if vals == {0}:
-            lits.append(f"{var}'")
-        elif vals == {1}:
-            lits.append(f"{var}")
-        else:
+    for i,var in enumerate(var_order):
+        bit = nvars-1-i  # MSB var_order[0]
+        if (vary >> bit) & 1:
             # eliminates this variable
-            pass
+            continue
+        lits.append(f"{var}" if (rep >> bit) & 1 else f"{var}'")
     if not lits:
         return "1"
     return "·".join(lits)
@@ -299,22 +346,12 @@ PALETTE = [
     "238,130,238","210,105,30","106,90,205","46,139,87","139,69,19",
 ]
 
-def render_kmap_html(model, values: Dict[int,str], groups: List[Set[int]]):
+def render_kmap_html(model, values: Dict[int,str], groups: List[Group]):
     R, C = model["R"], model["C"]
     rb, cb = model["rb"], model["cb"]
     rows_gray, cols_gray = model["rows_gray"], model["cols_gray"]
     var_order = model["var_order"]
-    cell_to_min = model["cell_to_min"]
-
-    def find_rect_for_group(minset: Set[int]) -> Tuple[int,int,int,int]:
-        target = set(minset)
-        for h,w in sorted(all_power2_sizes(R,C), key=lambda s: s[0]*s[1], reverse=True):
-            for r0 in range(R):
-                for c0 in range(C):
-                    cover = {cell_to_min[(r0+dr)%R][(c0+dc)%C] for dr in range(h) for dc in range(w)}
-                    if cover == target:
-                        return (r0,c0,h,w)
-        return (0,0,1,1)
+    cell_to_min = model["cell_to_min"].tolist()
 
     CELL = 44
     GAP  = 4
@@ -335,9 +372,8 @@ def render_kmap_html(model, values: Dict[int,str], groups: List[Set[int]]):
             )
 
     layers = []
-    for gi, g in enumerate(groups):
+    for gi, (_, (r0,c0,h,w)) in enumerate(groups):
         color = PALETTE[gi % len(PALETTE)]
-        r0,c0,h,w = find_rect_for_group(g)
         for (rs,cs,rh,cw) in _segments_for_wrap(r0,c0,h,w,R,C):
             left = cs*CELL + cs*GAP
             top  = rs*CELL + rs*GAP
@@ -510,7 +546,11 @@ are shown with translucency and distinct colors.
 
             nvars = len(used)
             var_order = [v for v in VAR_SET if v in used][:nvars]
-            ones = _eval_expr_to_minterms(expr, var_order)
+            try:
+                ones = _eval_expr_to_minterms(expr, var_order)
+            except ValueError as e:
+                st.error(f"Parse error: {e}")
+                return
             dcs  = set()
 
             _run_kmap_pipeline(nvars, var_order, ones, dcs, source_label="(from expression)")
@@ -553,7 +593,7 @@ def _run_kmap_pipeline(nvars: int, var_order: List[str], ones: Set[int], dcs: Se
     cover  = pick_cover(primes, ones)
 
     # Produce SOP
-    terms = [implicant_to_term(g, nvars, var_order) for g in cover]
+    terms = [implicant_to_term(model, rect) for _, rect in cover]
     sop = " + ".join(t for t in terms) if terms else "0"
 
     st.subheader("Minimized SOP")
@@ -561,8 +601,8 @@ def _run_kmap_pipeline(nvars: int, var_order: List[str], ones: Set[int], dcs: Se
 
     # List implicants
     st.subheader("Selected implicants")
-    for i, (g, t) in enumerate(zip(cover, terms), start=1):
-        st.markdown(f"- **Group {i}**: covers minterms `{sorted(g)}` → term **{t}**")
+    for i, ((g, _), t) in enumerate(zip(cover, terms), start=1):
+        st.markdown(f"- **Group {i}**: covers minterms `{mask_to_minterms(g)}` → term **{t}**")
 
     # K-map HTML
     st.subheader("K-map (Karnaugh)")